@@ -1,7 +1,20 @@
 from .settings import *
-from .river import River
-from .canoe import Canoe
-from .obstacle import Obstacle
-from .paddle_indicator import PaddleIndicator
-from .game_core import Game
-from .menu import Menu
\ No newline at end of file
+
+# The classes below load on first use, so the pygame-free modules
+# (e.g. game.simulation for headless runs) can be imported without pygame
+_EXPORTS = {
+    "River": ".river",
+    "Canoe": ".canoe",
+    "Obstacle": ".obstacle",
+    "PaddleIndicator": ".paddle_indicator",
+    "Simulation": ".simulation",
+    "Game": ".game_core",
+    "Menu": ".menu",
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,95 @@
+import io
+import os
+import logging
+import pygame
+from collections import OrderedDict
+from .settings import *
+
+logger = logging.getLogger("assets")
+
+
+class AssetManager:
+    """Process-wide cache of images, sounds and surfaces derived from them.
+
+    Each asset is loaded, converted to the display format, scaled or decoded
+    once and then shared by everyone who asks for it (Game, River, Menu, ...),
+    so restarting a round or going back to the menu never touches the disk.
+    When the cache grows over `budget` bytes, the least recently used assets
+    that are not pinned are evicted. Pin what callers keep for the whole
+    session (sprites, textures, sounds, music); derived surfaces stay unpinned,
+    and whoever still holds an evicted one keeps using it until they ask again.
+    """
+    def __init__(self, budget=ASSET_BUDGET_MB * 1024 * 1024):
+        self.budget = budget
+        self.entries = OrderedDict()  # key -> (asset, size in bytes), least recently used first
+        self.used = 0
+        self.pinned = set()  # keys evict() never drops
+
+    def image(self, name, size=None, alpha=True, pin=True):
+        """Image from images/, converted (with per-pixel alpha unless alpha=False) and optionally scaled"""
+        def load():
+            surface = pygame.image.load(os.path.join(IMAGES_DIR, name))
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            return pygame.transform.scale(surface, size) if size else surface
+        return self.get(("image", name, size, alpha), load, pin)
+
+    def sound(self, name):
+        """Decoded Sound from sounds/ (shared, so volume changes apply to every user)"""
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        return self.get(("sound", name), lambda: pygame.mixer.Sound(os.path.join(SOUNDS_DIR, name)), pin=True)
+
+    def music(self, name):
+        """In-memory file for mixer.music.load, so switching tracks doesn't read sounds/ again"""
+        def load():
+            with open(os.path.join(SOUNDS_DIR, name), 'rb') as f:
+                return f.read()
+        return io.BytesIO(self.get(("music", name), load, pin=True))
+
+    def get(self, key, factory, pin=False):
+        """Cached asset for `key`, built with factory() on first use. Also used for derived surfaces."""
+        if pin:
+            self.pinned.add(key)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        asset = factory()
+        size = asset_size(asset)
+        self.entries[key] = (asset, size)
+        self.used += size
+        if self.used > self.budget:
+            self.evict()
+        return asset
+
+    def evict(self):
+        """Drop least recently used assets that are not pinned until back under budget"""
+        for key in list(self.entries):
+            if self.used <= self.budget:
+                break
+            if key in self.pinned:
+                continue
+            size = self.entries.pop(key)[1]
+            self.used -= size
+            logger.info(f"Evicted asset {key} ({size // 1024} KiB)")
+
+    def clear(self):
+        self.entries.clear()
+        self.pinned.clear()
+        self.used = 0
+
+
+def asset_size(asset):
+    """Approximate memory used by a Surface, Sound or encoded file, in bytes"""
+    if isinstance(asset, pygame.Surface):
+        return asset.get_bytesize() * asset.get_width() * asset.get_height()
+    if isinstance(asset, pygame.mixer.Sound):
+        freq, fmt, channels = pygame.mixer.get_init()
+        return int(asset.get_length() * freq * channels * (abs(fmt) // 8))
+    if isinstance(asset, bytes):
+        return len(asset)
+    return 0
+
+
+assets = AssetManager()
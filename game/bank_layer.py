@@ -0,0 +1,106 @@
+import math
+import pygame
+from .settings import *
+from .assets import assets
+
+
+class BankLayer:
+    """Cached, scrolling surface holding the grass banks and their edge lines.
+
+    Every river segment owns one band of rows in a ring-shaped surface, picked by
+    its world segment index. Scrolling never moves pixels around: River only asks
+    for the bands it just exposed, and drawing is one or two blits per frame.
+
+    Bank positions come in screen pixels and are drawn at `scale` (the render
+    scale); bands are then segment_height * scale rows, rounded per band.
+
+    Given a `water_texture` the layer is opaque: bands get the water, anchored
+    to the world like the grass, instead of the transparent key colour. The
+    water then moves with the banks (no flow), but the river is one blit.
+    """
+    KEY_COLOR = (255, 0, 255)  # Transparent colour (where the water shows through)
+
+    def __init__(self, grass_texture, segment_height, capacity, width=SCREEN_WIDTH, scale=1.0, water_texture=None):
+        self.segment_height = segment_height
+        self.capacity = capacity  # Must be >= the number of live segments
+        self.scale = scale
+        self.band_height = segment_height * scale  # Rows per band (on average, when not a whole number)
+        self.width = width
+        self.height = self.band_top(capacity)
+
+        self.surface = pygame.Surface((width, self.height)).convert()
+        if water_texture is None:
+            self.surface.set_colorkey(self.KEY_COLOR)
+        self.surface.fill(self.KEY_COLOR)
+
+        # Grass (and water) pre-tiled across the full width, one band taller than the texture,
+        # so any segment band can be copied out of it with a single blit
+        self.grass_height = grass_texture.get_height()
+        self.grass_strip = assets.get(("grass_strip", grass_texture.get_size(), width, segment_height),
+                                      lambda: tile_strip(grass_texture, width, self.grass_height + math.ceil(self.band_height)))
+        self.water_strip = None
+        if water_texture is not None:
+            self.water_height = water_texture.get_height()
+            self.water_strip = assets.get(("water_strip", water_texture.get_size(), width, segment_height),
+                                          lambda: tile_strip(water_texture, width, self.water_height + math.ceil(self.band_height)))
+
+    def band_top(self, k):
+        """First row of ring band k (0 <= k <= capacity)"""
+        return int(k * self.band_height)
+
+    def render_segment(self, world_index, left1, right1, left2=None, right2=None):
+        """Render the band of one segment given its bank positions (and the next segment's, for the edge line)"""
+        k = world_index % self.capacity
+        top = self.band_top(k)
+        sh = self.band_top(k + 1) - top
+        band = pygame.Rect(0, top, self.width, sh)
+        scale = self.scale
+        if self.water_strip is None:
+            self.surface.fill(self.KEY_COLOR, band)
+        else:
+            # Only between the banks, the grass covers the rest
+            water_y = int(world_index * self.band_height) % self.water_height
+            water_left = max(int(left1 * scale), 0)
+            self.surface.blit(self.water_strip, (water_left, top),
+                              (water_left, water_y, int(right1 * scale) + 1 - water_left, sh))
+
+        # Grass is anchored to the world so it scrolls with the banks
+        grass_y = int(world_index * self.band_height) % self.grass_height
+        self.surface.set_clip(band)
+
+        edge = max(1, round(2 * scale))  # Edge line width
+        if left1 > 0:
+            self.surface.blit(self.grass_strip, band.topleft, (0, grass_y, int(left1 * scale), sh))
+            if left2 is not None:
+                pygame.draw.line(self.surface, BROWN, (left1 * scale, band.top), (left2 * scale, band.bottom), edge)
+
+        if right1 * scale < self.width:
+            self.surface.blit(self.grass_strip, (int(right1 * scale), band.top),
+                              (0, grass_y, self.width - int(right1 * scale), sh))
+            if right2 is not None:
+                pygame.draw.line(self.surface, BROWN, (right1 * scale, band.top), (right2 * scale, band.bottom), edge)
+
+        self.surface.set_clip(None)
+
+    def draw(self, screen, first_index, count, y):
+        """Blit `count` segment bands starting at world segment `first_index` to screen row `y` (before scaling)"""
+        count = min(count, self.capacity)
+        start = first_index % self.capacity
+        end = start + count
+        src_top = self.band_top(start)
+        y *= self.scale
+
+        first_part = self.band_top(min(end, self.capacity)) - src_top
+        screen.blit(self.surface, (0, y), (0, src_top, self.width, first_part))
+        if end > self.capacity:
+            # Wrapped around the end of the ring
+            screen.blit(self.surface, (0, y + first_part), (0, 0, self.width, self.band_top(end - self.capacity)))
+
+
+def tile_strip(texture, width, height):
+    """Opaque surface of the given size filled with copies of texture"""
+    strip = pygame.Surface((width, height)).convert()
+    for y in range(0, height, texture.get_height()):
+        for x in range(0, width, texture.get_width()):
+            strip.blit(texture, (x, y))
+    return strip
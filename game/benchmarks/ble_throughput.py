@@ -0,0 +1,65 @@
+"""Gateway throughput under synthetic BLE load.
+
+Runs BleGateway against SyntheticScanner with increasing numbers of paddles
+and reports, per run: advertisements offered and delivered per second, CPU
+per advertisement (callback only and whole scanning loop) and the delay from
+scheduled emission until the Message update is done (p50/p99). The scanner
+never skips an advertisement, so a gateway that cannot keep up falls behind
+schedule: a run counts as saturated when the p99 delay exceeds one
+advertising interval.
+
+    python -m game.benchmarks.ble_throughput --paddles 2 20 100 300 --rate 10
+"""
+import argparse
+import time
+from game.ble_backends import SyntheticScanner, synthetic_address
+from game.ble_gateway import BleGateway
+from game.paddle_registry import PaddleRegistry
+
+
+def run(paddles, rate, jitter, loss, duration, seed=1):
+    factory = SyntheticScanner.factory(paddles=paddles, rate=rate, jitter=jitter, loss=loss, seed=seed)
+    # Synthetic paddles in pairs, one canoe per pair
+    registry = PaddleRegistry()
+    for i in range(paddles):
+        registry.register(synthetic_address(i), i // 2, ("LEFT", "RIGHT")[i % 2])
+    gateway = BleGateway(registry, factory)
+    time.sleep(duration)
+    gateway.stop()
+
+    scanner = factory.scanner
+    emitted = max(scanner.emitted, 1)
+    p50, p99 = scanner.delays.percentiles((0.5, 0.99)) or (0.0, 0.0)
+    offered = paddles * rate * (1 - loss)
+    delivered = scanner.emitted / max(scanner.elapsed, 1e-9)
+    return {
+        "paddles": paddles,
+        "offered_per_s": offered,
+        "delivered_per_s": delivered,
+        "callback_us": scanner.callback_cpu / emitted * 1e6,
+        "loop_us": scanner.loop_cpu / emitted * 1e6,
+        "delay_p50_ms": p50,
+        "delay_p99_ms": p99,
+        "saturated": p99 > 1000 / rate,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paddles", type=int, nargs="+", default=[2, 10, 50, 100, 200, 400])
+    parser.add_argument("--rate", type=float, default=10.0, help="advertisements per second per paddle")
+    parser.add_argument("--jitter", type=float, default=0.2, help="interval jitter as a fraction of the interval")
+    parser.add_argument("--loss", type=float, default=0.05, help="probability an advertisement is lost")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    args = parser.parse_args()
+
+    print(f"{'paddles':>7} {'offered/s':>10} {'deliv/s':>9} {'cb us':>7} {'loop us':>8} {'p50 ms':>7} {'p99 ms':>7}")
+    for paddles in args.paddles:
+        r = run(paddles, args.rate, args.jitter, args.loss, args.duration)
+        print(f"{r['paddles']:>7} {r['offered_per_s']:>10.0f} {r['delivered_per_s']:>9.0f} {r['callback_us']:>7.1f} "
+              f"{r['loop_us']:>8.1f} {r['delay_p50_ms']:>7.2f} {r['delay_p99_ms']:>7.2f}"
+              f"{'  SATURATED' if r['saturated'] else ''}")
+
+
+if __name__ == "__main__":
+    main()
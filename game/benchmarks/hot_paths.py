@@ -0,0 +1,211 @@
+"""River, update and render hot paths, headless, against JSON baselines.
+
+Runs under SDL's dummy video and audio drivers with fixed seeds, so the same
+work is timed on every run. Each case is timed call by call, `repeat` rounds
+of `number` calls after an untimed warm-up round; the result is the mean of
+the fastest round (like timeit: the one least disturbed by other processes),
+plus the p95 and the fastest single call. --save writes the results as a
+baseline, --compare checks them against one and exits with status 1 when a
+case got slower than the threshold allows.
+
+    python -m game.benchmarks.hot_paths --save baseline-pi4.json
+    python -m game.benchmarks.hot_paths --compare baseline-pi4.json --threshold 0.1
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import numpy as np
+import pygame
+from game.settings import *
+from game.river import River
+from game.game_core import Game
+from game.menu import Menu
+from game.player import Player
+from game.input_schemes import KeyboardScheme
+from game.paddle_registry import PaddleRegistry
+from game.quality import LEVELS
+
+SEED = 1234
+RIVER_SPEEDS = (-UPSTREAM_SPEED, DOWNSTREAM_DRIFT, 0.5, 12.0)  # 12 px crosses several segments per call
+OBSTACLE_COUNTS = (0, 10, 100, 500)
+PADDLING = [("STRAIGHT", True, True)]
+RENDER_SCALES = (0.75, 0.5)  # Extra game_draw[play] runs at reduced internal resolution
+QUALITY_LEVELS = range(1, len(LEVELS))  # ... and at each of the adaptive quality governor's lower levels
+
+
+class Case:
+    """One benchmark: setup() runs untimed before every round, before() untimed before every call"""
+    def __init__(self, name, fn, setup=None, before=None):
+        self.name = name
+        self.fn = fn
+        self.setup = setup
+        self.before = before
+
+    def run(self, number, repeat):
+        self.round(number)  # Warm-up: caches, lazily built surfaces
+        rounds = [self.round(number) for _ in range(repeat)]
+        round_means = [sum(times) / number for times in rounds]
+        samples = [t for times in rounds for t in times]
+        samples = np.array(samples) * 1e6
+        return {"us": float(min(round_means) * 1e6),
+                "p95_us": float(np.percentile(samples, 95)),
+                "min_us": float(samples.min())}
+
+    def round(self, number):
+        """Seconds taken by each of `number` calls"""
+        if self.setup is not None:
+            self.setup()
+        times = []
+        for _ in range(number):
+            if self.before is not None:
+                self.before()
+            start = time.perf_counter()
+            self.fn()
+            times.append(time.perf_counter() - start)
+        return times
+
+
+def make_game(render_scale=1.0):
+    game = Game([Player(KeyboardScheme(pygame.K_LEFT, pygame.K_RIGHT))], UserSettings(render_scale=render_scale))
+    pygame.mixer.music.stop()
+    return game
+
+
+def reset_game(game, obstacles=0, on_screen=False):
+    """Seeded fresh round with `obstacles` obstacles: above the screen (they keep coming but never
+    reach the canoe during a round) or on screen away from the canoe (for drawing)"""
+    game.sim.rng = random.Random(SEED)
+    game.reset_game()
+    pygame.mixer.stop()
+    rng = random.Random(SEED)
+    for i in range(obstacles):
+        if on_screen:
+            x = rng.choice((rng.uniform(0, SCREEN_WIDTH / 2 - 150), rng.uniform(SCREEN_WIDTH / 2 + 70, SCREEN_WIDTH)))
+            game.sim.obstacles.spawn(x, rng.uniform(-OBSTACLE_HEIGHT, SCREEN_HEIGHT))
+        else:
+            game.sim.obstacles.spawn(rng.uniform(0, SCREEN_WIDTH - OBSTACLE_WIDTH), rng.uniform(-4000, -1000))
+
+
+def cases():
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    result = []
+
+    for speed in RIVER_SPEEDS:
+        river = River(SEED)
+        result.append(Case(f"river_update[{speed:g}]", lambda river=river, speed=speed: river.update(speed)))
+
+    river = River(SEED)
+    result.append(Case("river_draw", lambda: river.draw(screen, 0.5), before=lambda: river.update(-UPSTREAM_SPEED)))
+    still = River(SEED, still_water=True)
+    result.append(Case("river_draw[still]", lambda: still.draw(screen, 0.5), before=lambda: still.update(-UPSTREAM_SPEED)))
+
+    game = make_game()
+    for count in OBSTACLE_COUNTS:
+        def update(count=count):
+            game.update(PADDLING)
+            if game.game_over:
+                raise RuntimeError(f"game_update[{count}]: the canoe crashed, the case is not measuring play")
+        result.append(Case(f"game_update[{count}]", update, setup=lambda count=count: reset_game(game, count)))
+
+    result.append(Case("game_draw[play]", lambda: game.draw(0.5),
+                       setup=lambda: reset_game(game, 20, on_screen=True), before=lambda: game.update(PADDLING)))
+
+    for scale in RENDER_SCALES:
+        scaled = make_game(scale)
+        result.append(Case(f"game_draw[play@{scale:g}]", lambda scaled=scaled: scaled.draw(0.5),
+                           setup=lambda scaled=scaled: reset_game(scaled, 20, on_screen=True),
+                           before=lambda scaled=scaled: scaled.update(PADDLING)))
+
+    for level in QUALITY_LEVELS:
+        degraded = make_game()
+        degraded.governor.level = level
+        degraded.apply_quality()
+        result.append(Case(f"game_draw[play@q{level}]", lambda degraded=degraded: degraded.draw(0.5),
+                           setup=lambda degraded=degraded: reset_game(degraded, 20, on_screen=True),
+                           before=lambda degraded=degraded: degraded.update(PADDLING)))
+
+    def game_over():
+        reset_game(game)
+        while not game.game_over:
+            game.update([("STOP", False, False)])
+    result.append(Case("game_draw[game_over]", lambda: game.draw(1.0), setup=game_over))
+
+    menu = Menu(PaddleRegistry())
+    pygame.mixer.music.stop()
+    menu.settings = UserSettings(players=MAX_PLAYERS, player_names=["Ann", "Bob", "Cem", "Dee"])
+    for mode in ("menu", "settings"):
+        def draw_menu(mode=mode):
+            menu.draw()
+            pygame.display.flip()
+        result.append(Case(f"menu_draw[{mode}]", draw_menu, setup=lambda mode=mode: setattr(menu, "mode", mode)))
+    return result
+
+
+def environment():
+    return {"python": platform.python_version(), "pygame": pygame.version.ver,
+            "machine": platform.machine(), "node": platform.node(), "seed": SEED}
+
+
+def compare(results, baseline, threshold):
+    """Print each case against the baseline; returns the names that regressed"""
+    regressions = []
+    print(f"{'case':<24} {'baseline us':>12} {'now us':>10} {'change':>8}")
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<24} {'-':>12} {result['us']:>10.1f}      new")
+            continue
+        change = result["us"] / base["us"] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<24} {base['us']:>12.1f} {result['us']:>10.1f} {change:>+7.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200, help="calls per round")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds per case")
+    parser.add_argument("--only", nargs="+", metavar="PREFIX", help="run only cases whose name starts with one of these")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="slowdown counted as a regression (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = {}
+    for case in cases():
+        if args.only and not case.name.startswith(tuple(args.only)):
+            continue
+        results[case.name] = r = case.run(args.number, args.repeat)
+        print(f"{case.name:<24} {r['us']:>10.1f} us  p95 {r['p95_us']:>10.1f}  min {r['min_us']:>10.1f}")
+    pygame.quit()
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "number": args.number, "repeat": args.repeat,
+                       "results": results}, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("environment", {}).get("machine") != platform.machine():
+            print(f"Note: baseline was recorded on {baseline.get('environment', {}).get('machine')}")
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import logging
+import random
+import time
+from collections import namedtuple
+from .ble_capture import read_capture
+from .latency import RollingHistogram
+from .paddle_protocol import PADDLE_SERVICE_UUID
+
+logger = logging.getLogger("ble_gateway")
+
+# Minimal stand-ins for what the gateway callback reads from bleak's BLEDevice and AdvertisementData
+Device = namedtuple("Device", "address")
+AdvertisementData = namedtuple("AdvertisementData", "service_data rssi")
+
+
+class ReplayScanner:
+    """Scanner backend that plays a capture file into the detection callback.
+
+    Same interface as the part of BleakScanner that BleGateway uses, so it can
+    be passed as the gateway's scanner_factory. `speed` 1.0 keeps the recorded
+    timing, 2.0 plays twice as fast and 0 plays as fast as possible.
+    """
+    def __init__(self, path, detection_callback=None, service_uuids=None, speed=1.0):
+        self.path = path
+        self.detection_callback = detection_callback
+        self.speed = speed
+        self.task = None
+        self.finished = asyncio.Event()
+        self.count = 0
+
+    @classmethod
+    def factory(cls, path, speed=1.0):
+        """scanner_factory for BleGateway"""
+        return lambda detection_callback, service_uuids: cls(path, detection_callback, service_uuids, speed)
+
+    async def start(self):
+        self.task = asyncio.ensure_future(self.replay())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def replay(self):
+        start = time.monotonic()
+        first = None
+        for record in read_capture(self.path):
+            if first is None:
+                first = record.timestamp
+            if self.speed > 0:
+                delay = start + (record.timestamp - first) / self.speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif self.count % 256 == 0:
+                await asyncio.sleep(0)  # Flat out, but let the rest of the loop run now and then
+            service_data = {PADDLE_SERVICE_UUID: record.payload} if record.payload else {}
+            self.detection_callback(Device(record.address), AdvertisementData(service_data, record.rssi))
+            self.count += 1
+        logger.info(f"Replay of {self.path} finished ({self.count} advertisements)")
+        self.finished.set()
+
+
+def synthetic_address(index):
+    """MAC-style address of synthetic paddle `index` (locally administered range)"""
+    return f"02:00:00:00:{index >> 8 & 0xFF:02X}:{index & 0xFF:02X}"
+
+
+class SyntheticScanner:
+    """Scanner backend simulating `paddles` paddles, each advertising `rate` times per second.
+
+    Every paddle strokes for half of each `stroke_period` and idles for the
+    other half, bumping its sequence counter on every advertisement. Intervals
+    vary by +-`jitter` (a fraction of the interval) and each advertisement is
+    lost with probability `loss`. Also measures the gateway: callback CPU time
+    and the delay from an advertisement's scheduled emission until the callback
+    (and so the Message update) has finished, in a latency histogram.
+    """
+    def __init__(self, detection_callback=None, service_uuids=None, paddles=2, rate=10.0,
+                 jitter=0.2, loss=0.0, stroke_period=1.0, seed=None):
+        self.detection_callback = detection_callback
+        self.paddles = paddles
+        self.rate = rate
+        self.jitter = jitter
+        self.loss = loss
+        self.stroke_period = stroke_period
+        self.rng = random.Random(seed)
+        self.addresses = [synthetic_address(i) for i in range(paddles)]
+        self.task = None
+
+        # Measurements
+        self.emitted = 0
+        self.lost = 0
+        self.callback_cpu = 0.0  # Thread CPU seconds spent in the detection callback
+        self.loop_cpu = 0.0  # Thread CPU seconds of the whole scanning loop (callbacks + scheduling)
+        self.started_cpu = None
+        self.started = None
+        self.elapsed = 0.0  # Seconds between start() and stop()
+        self.delays = RollingHistogram(float("inf"))
+
+    @classmethod
+    def factory(cls, **options):
+        """scanner_factory for BleGateway; keeps the last scanner built as factory.scanner"""
+        def build(detection_callback, service_uuids):
+            build.scanner = cls(detection_callback, service_uuids, **options)
+            return build.scanner
+        build.scanner = None
+        return build
+
+    async def start(self):
+        self.started_cpu = time.thread_time()  # Runs on the gateway's loop thread
+        self.started = time.monotonic()
+        self.task = asyncio.ensure_future(self.advertise())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.loop_cpu = time.thread_time() - self.started_cpu
+            self.elapsed = time.monotonic() - self.started
+
+    def next_interval(self):
+        return (1 + self.rng.uniform(-self.jitter, self.jitter)) / self.rate
+
+    async def advertise(self):
+        start = time.monotonic()
+        # (next emission time, paddle index), paddles start spread over one interval
+        schedule = [(start + self.rng.random() / self.rate, i) for i in range(self.paddles)]
+        heapq.heapify(schedule)
+        seqs = [0] * self.paddles
+        devices = [Device(address) for address in self.addresses]
+
+        while True:
+            due, i = schedule[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            heapq.heapreplace(schedule, (due + self.next_interval(), i))
+
+            seqs[i] = (seqs[i] + 1) & 0xFF
+            if self.rng.random() < self.loss:
+                self.lost += 1
+                continue
+            # Paddles are out of phase with each other so strokes do not all line up
+            active = ((due - start) / self.stroke_period + i / self.paddles) % 1 < 0.5
+            data = AdvertisementData({PADDLE_SERVICE_UUID: bytes((active, seqs[i]))}, -60)
+
+            cpu = time.thread_time()
+            self.detection_callback(devices[i], data)
+            self.callback_cpu += time.thread_time() - cpu
+            self.delays.record((time.monotonic() - due) * 1_000_000, 0)
+            self.emitted += 1
@@ -0,0 +1,58 @@
+import struct
+from collections import namedtuple
+
+# Capture file: MAGIC, then one record per advertisement, appended as they arrive.
+# Record: little-endian float64 monotonic timestamp, int8 RSSI, uint8 address length,
+# uint16 payload length, then the address (ASCII) and the 0xFEAA service data bytes.
+MAGIC = b"PADCAP\x01\n"
+RECORD_HEADER = struct.Struct("<dbBH")
+
+CaptureRecord = namedtuple("CaptureRecord", "timestamp address rssi payload")
+
+
+class CaptureWriter:
+    """Appends advertisements to a capture file.
+
+    Writes go to a buffered file, so recording from the BLE callback is a
+    struct pack and a memory copy; the buffer is flushed every `flush_every`
+    records and on close().
+    """
+    def __init__(self, path, flush_every=256):
+        self.path = path
+        self.file = open(path, "ab", buffering=64 * 1024)
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        self.flush_every = flush_every
+        self.pending = 0
+        self.count = 0
+
+    def write(self, timestamp, address, rssi, payload):
+        address = address.encode("ascii")
+        rssi = max(-128, min(127, int(rssi if rssi is not None else -128)))
+        self.file.write(RECORD_HEADER.pack(timestamp, rssi, len(address), len(payload)))
+        self.file.write(address)
+        self.file.write(payload)
+        self.count += 1
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.file.flush()
+            self.pending = 0
+
+    def close(self):
+        self.file.close()
+
+
+def read_capture(path):
+    """Yield the CaptureRecords of a capture file in order (a truncated last record is skipped)"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a paddle capture file")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            timestamp, rssi, address_len, payload_len = RECORD_HEADER.unpack(header)
+            body = f.read(address_len + payload_len)
+            if len(body) < address_len + payload_len:
+                return
+            yield CaptureRecord(timestamp, body[:address_len].decode("ascii"), rssi, bytes(body[address_len:]))
@@ -1,24 +1,31 @@
 import asyncio
 import logging
 import threading
+import time
 from bleak import BleakScanner
-from .ble_message import Message
+from .paddle_registry import PaddleRegistry
+from .ble_capture import CaptureWriter
+from .paddle_protocol import PADDLE_SERVICE_UUID, decode_service_data
 
 logger = logging.getLogger("ble_gateway")
+advert_logger = logging.getLogger("ble_gateway.adverts")  # Per-advertisement log, sampled/rate limited in log_config.yaml
 
 class BleGateway:
     """
     BLE Gateway that runs in its own thread and communicates with the game via a queue.
-    Sends paddle state updates (left_paddle, right_paddle) to the game.
+    Sends paddle state updates (left_paddle, right_paddle) to the game, to the
+    Message of whichever canoe the paddle is registered to.
     """
     
-    def __init__(self, message: Message):
+    def __init__(self, registry: PaddleRegistry, scanner_factory=BleakScanner, capture_path=None):
         # Constants for paddle configuration
-        self.PADDLE_SERVICE_UUID = "0000feaa-0000-1000-8000-00805f9b34fb"
-        self.PADDLE_LEFT = "CD:35:60:84:D4:E3"
-        self.PADDLE_RIGHT = "C6:43:EA:BC:7A:D4"
+        self.PADDLE_SERVICE_UUID = PADDLE_SERVICE_UUID
         
-        self.message = message
+        self.registry = registry
+        # Anything built like BleakScanner(detection_callback=..., service_uuids=...), e.g. ReplayScanner.factory(path)
+        self.scanner_factory = scanner_factory
+        # Optional recording of every advertisement received, for replaying later
+        self.recorder = CaptureWriter(capture_path) if capture_path else None
         self.running = True
         self.thread = threading.Thread(target=self._run_async_loop, daemon=True)
         self.thread.start()
@@ -28,6 +35,9 @@ class BleGateway:
         self.running = False
         if self.thread:
             self.thread.join(timeout=5)
+        if self.recorder:
+            self.recorder.close()
+            logger.info(f"Recorded {self.recorder.count} advertisements to {self.recorder.path}")
         logger.info("BLE Gateway stopped")
     
     def _run_async_loop(self):
@@ -40,24 +50,31 @@ class BleGateway:
         finally:
             loop.close()
         
-    # TODO: Forward the data through the message object to the game
     async def _listen_to_paddles(self):
         """Listen to paddle state changes."""
         def callback(device, advertisement_data):
-
-            if device.address == self.PADDLE_LEFT:
-                logger.info(f"Left: {advertisement_data.service_data}")
-                self.message.LEFT = True
-
-            if device.address == self.PADDLE_RIGHT:
-                logger.info(f"Right: {advertisement_data.service_data}")
-                self.message.RIGHT = True
-                
-            logging.info("-" * 40)
+            # Runs for every advertisement, so keep it to a dict lookup and a decode
+            received = time.monotonic()
+            if self.recorder:
+                self.recorder.write(received, device.address, advertisement_data.rssi,
+                                    advertisement_data.service_data.get(self.PADDLE_SERVICE_UUID, b""))
+            route = self.registry.routes.get(device.address)
+            if route is None:
+                self.registry.saw_unknown(device.address, received)  # Candidate for pairing
+                return
+            message, side = route
+            decoded = decode_service_data(advertisement_data.service_data)
+            if decoded is None:
+                logger.debug("%s: undecodable service data %s", side, advertisement_data.service_data)
+                return
+            active, seq = decoded
+            if message.update(side, active, seq, received):
+                advert_logger.info("%s %s: active=%s seq=%s", device.address, side, active, seq)
             
-        scanner = BleakScanner(detection_callback=callback, service_uuids=[self.PADDLE_SERVICE_UUID])
+        scanner = self.scanner_factory(detection_callback=callback, service_uuids=[self.PADDLE_SERVICE_UUID])
         await scanner.start()
-        self.message.CONFIGURED.set()
+        for message in list(self.registry.messages.values()):
+            message.CONFIGURED.set()
         logger.info("Started listening to paddles")
         try:
             while self.running:
@@ -1,21 +1,122 @@
 import logging
 import threading
-from game.direction import Direction
+import time
+from collections import deque, namedtuple
+from game.direction import Direction, direction_for
+from game.settings import PADDLE_STALE_TIMEOUT, STROKE_QUEUE_SIZE
+from game.latency import latency_tracker
 
 logger = logging.getLogger("ble_message")
 
-class Message:
+# Consistent view of both paddles, published as a whole (seq goes up with every publish)
+PaddleSnapshot = namedtuple("PaddleSnapshot", "seq left right left_time right_time")
+
+# A paddle changing state: active=True when a stroke starts, False when it ends.
+# timestamp is when the advertisement was received, published when the snapshot with it went out.
+StrokeEvent = namedtuple("StrokeEvent", "side active timestamp published")
+
+
+class PaddleState:
+    """Last decoded advertisement of one paddle (gateway thread only)"""
+    __slots__ = ("active", "seq", "timestamp")
+
     def __init__(self):
-        self.LEFT = False
-        self.RIGHT = False
+        self.active = False
+        self.seq = None  # Sequence number of the last accepted advertisement
+        self.timestamp = None  # time.monotonic() of the last advertisement received
+
+
+class Message:
+    """Paddle states shared between the BLE gateway thread and the game.
+
+    Double buffered: the gateway (the only writer) updates its own PaddleState
+    per side and then publishes an immutable PaddleSnapshot of both sides by
+    swapping one reference, so readers never see LEFT from one advertisement and
+    RIGHT from another and never wait on a lock. Every state change is also
+    appended to a bounded stroke queue, which the game drains each tick so
+    strokes shorter than a tick are not lost.
+
+    A paddle whose last advertisement is older than `stale_timeout` seconds
+    reads as idle, so a lost "stroke ended" advertisement cannot leave the
+    canoe rowing forever.
+    """
+    def __init__(self, stale_timeout=PADDLE_STALE_TIMEOUT, queue_size=STROKE_QUEUE_SIZE):
+        self.stale_timeout = stale_timeout
+        self.paddles = {"LEFT": PaddleState(), "RIGHT": PaddleState()}
+        self.snapshot = PaddleSnapshot(0, False, False, None, None)
+        self.strokes = deque(maxlen=queue_size)  # append/popleft are atomic, no lock needed
         self.CONFIGURED = threading.Event()
-        
+
+    def update(self, side, active, seq, timestamp=None):
+        """Store a decoded advertisement for side ("LEFT"/"RIGHT"). Returns False for a repeated sequence number."""
+        paddle = self.paddles[side]
+        paddle.timestamp = time.monotonic() if timestamp is None else timestamp
+        if seq == paddle.seq:
+            self.publish()  # Same reading re-advertised: only keeps the paddle fresh
+            return False
+        paddle.seq = seq
+        stroke = active != paddle.active
+        paddle.active = active
+        self.publish()
+        if stroke:
+            self.strokes.append(StrokeEvent(side, active, paddle.timestamp, time.monotonic()))
+        return True
+
+    def publish(self):
+        left, right = self.paddles["LEFT"], self.paddles["RIGHT"]
+        self.snapshot = PaddleSnapshot(self.snapshot.seq + 1, left.active, right.active,
+                                       left.timestamp, right.timestamp)
+
+    def set_paddle(self, side, active):
+        """Plain state change without an advertisement (keyboard stand-ins, tests)"""
+        self.update(side, active, object())  # A fresh object never repeats a sequence number
+
+    def drain_strokes(self):
+        """All stroke events queued since the last drain, oldest first"""
+        strokes = []
+        while self.strokes:
+            strokes.append(self.strokes.popleft())
+        return strokes
+
+    def discard_strokes(self):
+        """Drop the queued strokes unread, e.g. the ones rowed on the menu and pairing
+        screens, so they neither replay as a stroke nor count as input latency"""
+        self.strokes.clear()
+
+    def current(self, now=None):
+        """(left, right) activity from the latest snapshot, with stale paddles reading as idle"""
+        snapshot = self.snapshot  # One read: both sides come from the same publish
+        now = time.monotonic() if now is None else now
+        left = snapshot.left and now - snapshot.left_time <= self.stale_timeout
+        right = snapshot.right and now - snapshot.right_time <= self.stale_timeout
+        return left, right
+
+    @property
+    def LEFT(self):
+        return self.current()[0]
+
+    @LEFT.setter
+    def LEFT(self, active):
+        self.set_paddle("LEFT", active)
+
+    @property
+    def RIGHT(self):
+        return self.current()[1]
+
+    @RIGHT.setter
+    def RIGHT(self, active):
+        self.set_paddle("RIGHT", active)
+
     def get_direction(self) -> Direction:
-        direction = "STOP"
-        if self.LEFT and self.RIGHT:
-            direction = "STRAIGHT"
-        elif self.RIGHT:
-            direction = "LEFT"
-        elif self.LEFT:
-            direction = "RIGHT"
-        return Direction(self.LEFT, self.RIGHT, direction)
\ No newline at end of file
+        """Direction for one game tick. Consumes the queued strokes: a stroke that
+        started since the last call counts even if it has already ended."""
+        left, right = self.current()
+        strokes = self.drain_strokes()
+        latency_tracker.strokes_read(strokes)
+        for stroke in strokes:
+            if stroke.active:
+                if stroke.side == "LEFT":
+                    left = True
+                else:
+                    right = True
+        return direction_for(left, right)
@@ -7,42 +7,29 @@ class Canoe:
         self.y = y
         self.width = CANOE_WIDTH
         self.height = CANOE_HEIGHT
-        self.speed = CANOE_SPEED
         self.boat_img = boat_img
 
-    def move(self, direction):
-        """Move canoe based on paddle input"""
-        if direction == "LEFT":
-            self.x -= self.speed
-        elif direction == "RIGHT":
-            self.x += self.speed
-        # No boundary check here - will be checked against river bounds in game
-
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
+        """Draw at `scale` (the render scale: boat_img is expected at that size already)"""
+        x, y = self.x * scale, self.y * scale
         if self.boat_img:
             # Draw boat image
-            screen.blit(self.boat_img, (self.x, self.y))
+            screen.blit(self.boat_img, (x, y))
         else:
             # Fallback to original drawing
+            width, height = self.width * scale, self.height * scale
             pygame.draw.rect(screen, (139, 69, 19),
-                            (self.x, self.y, self.width, self.height))
+                            (x, y, width, height))
             pygame.draw.rect(screen, BLACK,
-                            (self.x, self.y, self.width, self.height), 3)
+                            (x, y, width, height), 3)
             points = [
-                (self.x, self.y),
-                (self.x + self.width, self.y),
-                (self.x + self.width // 2, self.y - 15)
+                (x, y),
+                (x + width, y),
+                (x + width // 2, y - 15 * scale)
             ]
             pygame.draw.polygon(screen, (139, 69, 19), points)
             pygame.draw.polygon(screen, BLACK, points, 3)
 
-    def get_rect(self):
-        return pygame.Rect(self.x, self.y, self.width, self.height)
-
-    def get_collision_rect(self):
-        """Smaller hitbox for more accurate collision detection"""
-        # Shrink hitbox by 30% on all sides
-        margin_x = self.width * 0.15
-        margin_y = self.height * 0.15
-        return pygame.Rect(self.x + margin_x, self.y + margin_y,
-                          self.width - margin_x * 2, self.height - margin_y * 2)
+    def get_draw_rect(self):
+        """Screen area touched by draw() (the fallback drawing has a bow above the hull)"""
+        return pygame.Rect(self.x, self.y - 15, self.width, self.height + 15).inflate(4, 4)
@@ -0,0 +1,32 @@
+import pygame
+
+
+class Canvas:
+    """Offscreen surface the world is drawn into at `scale` times the window's resolution.
+
+    Everything keeps working in window (settings.py) coordinates; drawing code
+    multiplies positions and sizes by `scale` (see size()), and present()
+    scales the finished canvas up to the window. At scale 1 the canvas is the
+    window itself and present() does nothing.
+    """
+    def __init__(self, window, scale=1.0, smooth=False):
+        self.window = window
+        self.scale = scale
+        self.smooth = smooth
+        if scale == 1:
+            self.surface = window
+        else:
+            self.surface = pygame.Surface(self.size(*window.get_size())).convert()
+
+    def size(self, width, height):
+        """Canvas pixels for a size in window pixels"""
+        return max(1, round(width * self.scale)), max(1, round(height * self.scale))
+
+    def present(self):
+        """Scale the canvas up onto the window (which still needs flipping)"""
+        if self.surface is self.window:
+            return
+        if self.smooth:
+            pygame.transform.smoothscale(self.surface, self.window.get_size(), self.window)
+        else:
+            pygame.transform.scale(self.surface, self.window.get_size(), self.window)
@@ -2,4 +2,17 @@ class Direction:
     def __init__(self, left:bool, right: bool, direction_str: str):
         self.left = left
         self.right = right
-        self.direction_str = direction_str
\ No newline at end of file
+        self.direction_str = direction_str
+
+
+# One shared, read-only Direction per paddle combination, so input polling never allocates
+DIRECTIONS = {
+    (False, False): Direction(False, False, "STOP"),
+    (True, True): Direction(True, True, "STRAIGHT"),
+    (False, True): Direction(False, True, "LEFT"),   # Right paddle turns left
+    (True, False): Direction(True, False, "RIGHT"),  # Left paddle turns right
+}
+
+
+def direction_for(left, right) -> Direction:
+    return DIRECTIONS[bool(left), bool(right)]
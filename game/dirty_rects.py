@@ -0,0 +1,43 @@
+import pygame
+from .settings import *
+
+
+class DirtyRects:
+    """Collects the screen regions that changed this frame and presents only those.
+
+    Falls back to a full flip when the frame was invalidated or when the changed
+    area is large enough that one flip is cheaper than many small updates.
+    """
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT), full_ratio=0.6):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.max_area = size[0] * size[1] * full_ratio
+        self.rects = []
+        self.area = 0
+        self.full = True  # First frame is always presented in full
+
+    def invalidate(self):
+        """Mark the whole frame as changed"""
+        self.full = True
+
+    def add(self, rect):
+        if self.full:
+            return
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.w and rect.h:
+            self.rects.append(rect)
+            self.area += rect.w * rect.h
+            if self.area >= self.max_area:
+                self.full = True
+
+    def add_all(self, rects):
+        for rect in rects:
+            self.add(rect)
+
+    def present(self):
+        if self.full:
+            pygame.display.flip()
+        elif self.rects:
+            pygame.display.update(self.rects)
+        self.rects.clear()
+        self.area = 0
+        self.full = False
@@ -0,0 +1,126 @@
+import csv
+import json
+import logging
+import time
+import numpy as np
+
+logger = logging.getLogger("profiler")
+
+# Frame phases, in the order a game frame goes through them
+PHASES = ("input", "river scroll", "obstacles", "collisions", "update other",
+          "water", "banks", "sprites", "scale", "hud", "flip", "tick sleep")
+PHASE_INDEX = {phase: i for i, phase in enumerate(PHASES)}
+
+
+class FrameProfiler:
+    """Where each frame's time goes, per phase, over the last `capacity` frames.
+
+    The loops call lap(phase) after each phase, which adds the time since the
+    previous lap to that phase, and end_frame() once per frame, which stores
+    the frame's row in a ring buffer. Ticks run several times per frame (or
+    not at all), so their phases add up within the frame. While disabled,
+    lap() and end_frame() return straight away. Each frame also records the
+    drawing quality level it ran at (set_quality(), -1 while none is set).
+    """
+    def __init__(self, capacity=600):
+        self.enabled = False
+        self.samples = np.zeros((capacity, len(PHASES)))  # Seconds, ring buffer of frames
+        self.levels = np.full(capacity, -1, dtype=np.int8)  # Quality level of each frame in the ring
+        self.frames = 0  # Frames recorded since the start (the ring holds the last `capacity`)
+        self.level = -1
+        self.level_names = {}  # Level -> name, for the dump and the overlay
+        self.current = [0.0] * len(PHASES)
+        self.last = 0.0
+        self.rows = ()  # Overlay rows, refreshed twice a second
+        self.rows_refreshed = 0.0
+
+    def set_quality(self, level, name):
+        self.level = level
+        self.level_names[level] = name
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.current = [0.0] * len(PHASES)
+        self.last = time.perf_counter()
+        logger.info(f"Frame profiler {'on' if self.enabled else 'off'}")
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[PHASE_INDEX[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.samples[self.frames % len(self.samples)] = self.current
+        self.levels[self.frames % len(self.samples)] = self.level
+        self.frames += 1
+        self.current = [0.0] * len(PHASES)
+
+    def recorded(self):
+        """Recorded frames, oldest first (frames x phases, seconds)"""
+        return self._in_order(self.samples)
+
+    def recorded_levels(self):
+        """Quality level of each recorded frame, oldest first"""
+        return self._in_order(self.levels)
+
+    def _in_order(self, ring):
+        capacity = len(ring)
+        if self.frames <= capacity:
+            return ring[:self.frames]
+        return np.roll(ring, -(self.frames % capacity), axis=0)
+
+    def means(self, frames=60):
+        """Mean milliseconds per phase over the last `frames` frames"""
+        recorded = self.recorded()[-frames:]
+        if len(recorded) == 0:
+            return np.zeros(len(PHASES))
+        return recorded.mean(axis=0) * 1000
+
+    def overlay_rows(self):
+        """(phase, mean ms) rows and the whole frame, for the overlay"""
+        now = time.perf_counter()
+        if now - self.rows_refreshed >= 0.5:
+            means = self.means()
+            self.rows = tuple(zip(PHASES, np.round(means, 2).tolist())) + (("frame", round(float(means.sum()), 2)),)
+            self.rows_refreshed = now
+        return self.rows
+
+    def overlay_title(self):
+        """Current quality level for the overlay, None when no level is set"""
+        if self.level < 0:
+            return None
+        return f"quality {self.level}: {self.level_names[self.level]}"
+
+    def summary(self):
+        """{phase: {"mean", "p50", "p95", "p99", "max"}} in milliseconds over the recorded frames, plus the whole frame"""
+        recorded = self.recorded() * 1000
+        if len(recorded) == 0:
+            return {}
+        table = np.column_stack((recorded, recorded.sum(axis=1)))
+        p50, p95, p99 = np.percentile(table, (50, 95, 99), axis=0)
+        means, maxes = table.mean(axis=0), table.max(axis=0)
+        return {phase: {"mean": float(means[i]), "p50": float(p50[i]), "p95": float(p95[i]),
+                        "p99": float(p99[i]), "max": float(maxes[i])}
+                for i, phase in enumerate(PHASES + ("frame",))}
+
+    def dump(self, csv_path, json_path):
+        """Every recorded frame to csv_path (milliseconds per phase, quality level) and the percentiles
+        and frames per quality level to json_path"""
+        recorded = self.recorded() * 1000
+        levels = self.recorded_levels().tolist()
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(PHASES + ("frame", "quality"))
+            for row, level in zip(recorded.tolist(), levels):
+                writer.writerow([f"{value:.3f}" for value in row + [sum(row)]] + [level])
+        quality = {self.level_names.get(level, "unset"): levels.count(level) for level in sorted(set(levels))}
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"frames": len(recorded), "quality_frames": quality, "phases": self.summary()}, f, indent=2)
+        logger.info(f"Frame profile ({len(recorded)} frames) written to {csv_path} and {json_path}")
+
+
+frame_profiler = FrameProfiler()
@@ -1,6 +1,7 @@
 import pygame
-import random
 import os
+import time
+from functools import lru_cache
 
 from game.player import Player
 from .settings import *
@@ -8,8 +9,18 @@ from .river import River
 from .canoe import Canoe
 from .obstacle import Obstacle
 from .paddle_indicator import PaddleIndicator
+from .dirty_rects import DirtyRects
+from .canvas import Canvas
+from .simulation import Simulation, POINT_SCORED, GAME_OVER
+from .hud import ScoreBox, StatsPanel, BarGraphPanel
+from .text_cache import get_font, render_text
+from .assets import assets
+from .latency import latency_tracker
+from .frame_profiler import frame_profiler
+from .quality import QualityGovernor, LEVELS
 
 BASE_DIR = os.path.dirname(__file__)
+LATENCY_DUMP = os.path.join(BASE_DIR, "latency.json")
 
 # Palette for end game messages
 PALETTE = {
@@ -38,9 +49,10 @@ def draw_keycap(surface, text, x, y, font):
     sh.fill(PALETTE["shadow"]); surface.blit(sh, (cap.x+2, cap.y+2))
     pygame.draw.rect(surface, PALETTE["keycap_bg"], cap, border_radius=8)
     pygame.draw.rect(surface, (255,255,255,50), cap, 2, border_radius=8)
-    lbl = font.render(text, True, PALETTE["keycap_fg"])
+    lbl = render_text(font, text, PALETTE["keycap_fg"])
     surface.blit(lbl, lbl.get_rect(center=cap.center))
 
+@lru_cache(maxsize=64)
 def wrap_lines(font, text, max_width):
     words, lines, line = text.split(), [], ""
     for w in words:
@@ -51,43 +63,51 @@ def wrap_lines(font, text, max_width):
             if line: lines.append(line)
             line = w
     if line: lines.append(line)
-    return lines 
+    return tuple(lines)
 
 class Game:
-    def __init__(self, player: Player, settings: UserSettings = None):
-        self.player = player
+    def __init__(self, players: list[Player], settings: UserSettings = None, spectators=None, scores=None):
+        # One canoe per player, all on the same river (a single Player still works)
+        self.players = players if isinstance(players, list) else [players]
         self.settings = settings if settings is not None else UserSettings()
+        self.spectators = spectators  # Optional SpectatorServer, gets the state once per tick
+        self.scores = scores  # Optional ScoreStore, finished rounds are recorded there
+        if self.scores is not None:
+            self.scores.request_top(self.settings.difficulty)  # Ready by the first game over
 
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Canoe Game - IoT Demo")
         self.clock = pygame.time.Clock()
+        # The world (river, canoes, rocks) is drawn at render_scale and scaled up; HUD and text stay sharp on the window
+        self.set_render_scale(self.settings.render_scale)
 
         # Fonts for end game messages
         try:
-            self.title_font = pygame.font.SysFont("Impact", 74)
-            self.body_font  = pygame.font.SysFont("Bahnschrift", 36)
-            self.small_font = pygame.font.SysFont("Bahnschrift", 26)
-            self.key_font   = pygame.font.SysFont("Bahnschrift", 26)
+            self.title_font = get_font("Impact", 74)
+            self.body_font  = get_font("Bahnschrift", 36)
+            self.small_font = get_font("Bahnschrift", 26)
+            self.key_font   = get_font("Bahnschrift", 26)
         except:
-            self.title_font = pygame.font.SysFont(None, 74)
-            self.body_font  = pygame.font.SysFont(None, 36)
-            self.small_font = pygame.font.SysFont(None, 26)
-            self.key_font   = pygame.font.SysFont(None, 26)
+            self.title_font = get_font(None, 74)
+            self.body_font  = get_font(None, 36)
+            self.small_font = get_font(None, 26)
+            self.key_font   = get_font(None, 26)
+        self.score_font = get_font(None, 36)
 
-        # Load images and scale to game sizes
-        self.boat_img = pygame.image.load(os.path.join(BASE_DIR, 'images', 'boat.png')).convert_alpha()
-        self.rock_img = pygame.image.load(os.path.join(BASE_DIR,'images','rock.png')).convert_alpha()
+        # HUD score boxes (one per player, stacked), only re-rendered when the score changes
+        self.score_boxes = [ScoreBox((10, 10 + i * 90, 240, 80), self.small_font, self.score_font)
+                            for i in range(len(self.players))]
 
-        # Scale to original game dimensions
-        self.boat_img = pygame.transform.scale(self.boat_img, (CANOE_WIDTH, CANOE_HEIGHT))
-        self.rock_img = pygame.transform.scale(self.rock_img, (OBSTACLE_WIDTH, OBSTACLE_HEIGHT))
+        # Game over overlay is the same every time
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill(PALETTE["overlay"])
 
-        # Load sound effects
+        # Sound effects (decoded once per process)
         pygame.mixer.init()
-        self.sound_game_start = pygame.mixer.Sound(os.path.join(BASE_DIR,'sounds','game_start.mp3'))
-        self.sound_game_over = pygame.mixer.Sound(os.path.join(BASE_DIR,'sounds','game_over.mp3'))
-        self.sound_point = pygame.mixer.Sound(os.path.join(BASE_DIR,'sounds','point.mp3'))
+        self.sound_game_start = assets.sound('game_start.mp3')
+        self.sound_game_over = assets.sound('game_over.mp3')
+        self.sound_point = assets.sound('point.mp3')
 
         # Apply volume settings
         sfx_vol = self.settings.sfx_vol / 100
@@ -95,166 +115,186 @@ class Game:
         self.sound_game_over.set_volume(sfx_vol)
         self.sound_point.set_volume(sfx_vol)
 
-        # Load background music
-        pygame.mixer.music.load(os.path.join(BASE_DIR,'sounds','river_splashy.mp3'))
+        # Background music (read from disk once per process)
+        pygame.mixer.music.load(assets.music('river_splashy.mp3'), 'mp3')
         pygame.mixer.music.set_volume(self.settings.music_vol / 100)
 
-        # Apply difficulty settings
-        spf, spdf = difficulty_factors(self.settings.difficulty)
-        self.spawn_interval = BASE_SPAWN_INTERVAL * spf * 1000  # Convert to milliseconds
-        self.obstacle_speed = BASE_OBSTACLE_SPEED * spdf
-
-        self.reset_game()
+        # Game logic runs in the pygame-free simulation at a fixed tick rate;
+        # Game renders it (interpolating between ticks) and plays the sounds
+        # Drawing quality, stepped down (and back up) by the governor to hold FPS
+        self.governor = QualityGovernor() if self.settings.adaptive_quality else None
+        self.quality = LEVELS[0]
+        frame_profiler.set_quality(0, self.quality.name)
+        self.sim = Simulation(self.settings, river_factory=lambda seed: River(seed, self.canvas.scale, self.quality.still_water),
+                              canoes=len(self.players))
+        self.canoes = [Canoe(x, y, self.boat_img) for x, y in zip(self.sim.fleet.x, self.sim.fleet.y)]
+
+        # Optional dirty-rect presentation (None = flip the whole frame every time)
+        self.dirty = DirtyRects() if self.settings.dirty_rects else None
+        self.sprite_rects = []  # Where sprites were drawn last frame
+        self.hud_state = None  # What the HUD and indicators showed last frame
+
+        # Paddle-to-photon latency overlay (F3 toggles, F4 dumps to latency.json)
+        self.latency_panel = StatsPanel((SCREEN_WIDTH - 530, 10), get_font("Courier New", 16))
+        self.show_latency = False
+        self.latency_lines = ()
+        self.latency_refreshed = 0.0
+        # Frame phase profiler overlay (F5 toggles; shown while the profiler records)
+        self.profiler_panel = BarGraphPanel((SCREEN_WIDTH - 330, 130), get_font("Courier New", 14))
+
+        self.start_round()
 
         # Paddle indicators (moved to bottom of screen)
         self.left_indicator = PaddleIndicator(50, SCREEN_HEIGHT - 100, "LEFT")
         self.right_indicator = PaddleIndicator(SCREEN_WIDTH - 130, SCREEN_HEIGHT - 100, "RIGHT")
 
-        # Player name
-        self.player_name = self.settings.player_names[0].strip() if self.settings.player_names[0].strip() else "Player 1"
+        # Player names
+        names = self.settings.player_names + [""] * len(self.players)
+        self.player_names = [names[i].strip() or f"Player {i + 1}" for i in range(len(self.players))]
+        self.player_name = self.player_names[0]
+
+    @property
+    def river(self):
+        return self.sim.river
+
+    @property
+    def obstacles(self):
+        return self.sim.obstacles
+
+    @property
+    def game_over(self):
+        return self.sim.game_over
+
+    @property
+    def game_won(self):
+        return self.sim.game_won
+
+    def set_render_scale(self, scale):
+        """(Re)create the canvas and the sprite images for drawing the world at `scale`"""
+        self.canvas = Canvas(self.screen, scale, self.settings.smooth_scaling)
+        # Images scaled to game sizes at the render scale (shared through the asset manager)
+        self.boat_img = assets.image('boat.png', self.canvas.size(CANOE_WIDTH, CANOE_HEIGHT))
+        self.rock_img = assets.image('rock.png', self.canvas.size(OBSTACLE_WIDTH, OBSTACLE_HEIGHT))
+        self.crashed_boat_img = assets.get(("crashed_boat", self.boat_img.get_size()), self.make_crashed_boat)
+
+    def make_crashed_boat(self):
+        """Faded boat for canoes that are out of the race"""
+        crashed = self.boat_img.copy()
+        crashed.set_alpha(110)
+        return crashed
 
     def reset_game(self):
-        self.river = River()
-        self.canoe = Canoe(SCREEN_WIDTH // 2 - CANOE_WIDTH // 2,
-                          SCREEN_HEIGHT // 2,  # Start at middle of screen
-                          self.boat_img)
-        self.obstacles = []
-        self.game_over = False
-        self.game_won = False
-        self.last_spawn_time = pygame.time.get_ticks()
-
-        self.player.score = 0
+        self.sim.reset()
+        self.start_round()
+
+    def start_round(self):
+        """Reset everything Game keeps on top of the simulation, and start the music"""
+        for canoe, x, y in zip(self.canoes, self.sim.fleet.x, self.sim.fleet.y):
+            canoe.x, canoe.y = x, y
+        self.game_over_drawn = False
+        self.game_over_frame = None
+        self.overlays_shown = None
+        self.drawn_high_scores = None
+        if self.dirty is not None:
+            self.dirty.invalidate()
+
+        for player in self.players:
+            player.score = 0
+            player.discard_input()  # Strokes from the menu or the game over screen
 
         # Play game start sound and start background music
         self.sound_game_start.play()
         pygame.mixer.music.set_volume(0.75)  # Set volume to 75% (25% reduction)
         pygame.mixer.music.play(-1)  # Loop background music indefinitely
-        
-    def spawn_obstacle(self):
-        # Get river bounds at the top of the screen where obstacles spawn
-        spawn_y = 0
-        left_bound, right_bound = self.river.get_river_bounds_at_y(spawn_y)
-
-        # Spawn obstacle within river bounds
-        # Add some margin to keep obstacles away from the banks
-        margin = 20
-        left_bound += margin
-        right_bound -= margin + OBSTACLE_WIDTH
-
-        if right_bound > left_bound:
-            x = random.randint(int(left_bound), int(right_bound))
-            self.obstacles.append(Obstacle(x, -OBSTACLE_HEIGHT, self.rock_img))
-        
-    def check_collision(self):
-        canoe_rect = self.canoe.get_collision_rect()  # Use smaller hitbox
-        for obstacle in self.obstacles:
-            if canoe_rect.colliderect(obstacle.get_rect()):
-                return True
-        return False
-    
-    def update(self, direction, left_paddle, right_paddle):
+
+    def update(self, inputs):
+        """One tick; `inputs` holds (direction, left_paddle, right_paddle) for every player"""
         if self.game_over or self.game_won:
             return
 
-        # Update paddle indicators
+        # Update paddle indicators (player 1's paddles)
+        _, left_paddle, right_paddle = inputs[0]
         self.left_indicator.set_active(left_paddle)
         self.right_indicator.set_active(right_paddle)
 
-        # Move canoe horizontally
-        self.canoe.move(direction)
-
-        # Handle vertical movement based on paddling
-        is_rowing = left_paddle or right_paddle
-        river_scroll_speed = 0
-        if is_rowing:
-            # Move UP (fighting the current) - river banks should move DOWN
-            self.canoe.y -= UPSTREAM_SPEED
-            # Limit how far up the canoe can go (around halfway)
-            if self.canoe.y < CANOE_MAX_UP_Y:
-                self.canoe.y = CANOE_MAX_UP_Y
-            # Negative scroll makes river move DOWN on screen
-            river_scroll_speed = -UPSTREAM_SPEED
-            self.river.update(river_scroll_speed)
-        else:
-            # Drift DOWN (current pushing down) - river banks should move UP
-            self.canoe.y += DOWNSTREAM_DRIFT
-            # Positive scroll makes river move UP on screen
-            river_scroll_speed = DOWNSTREAM_DRIFT
-            self.river.update(river_scroll_speed)
-
-        # Check if canoe hit the bottom of the screen (game over)
-        if self.canoe.y + self.canoe.height >= SCREEN_HEIGHT:
-            if not self.game_over:
-                self.sound_game_over.play()
-                pygame.mixer.music.stop()  # Stop background music
-            self.game_over = True
-
-        # Update obstacles with river scroll
-        for obstacle in self.obstacles[:]:
-            obstacle.update(river_scroll_speed)
-            # Award points if obstacle passed the canoe
-            if obstacle.y > self.canoe.y + self.canoe.height and not hasattr(obstacle, 'counted'):
-                self.player.score += 1
+        frame_profiler.lap("update other")
+        for event in self.sim.step(inputs):
+            if event == POINT_SCORED:
                 self.sound_point.play()  # Play point sound
-                obstacle.counted = True  # Mark as counted so we don't count it again
-            if obstacle.is_off_screen():
-                self.obstacles.remove(obstacle)
-
-        # Spawn new obstacles (using difficulty-based spawn interval)
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_spawn_time > self.spawn_interval:
-            self.spawn_obstacle()
-            self.last_spawn_time = current_time
-
-        # Check collisions with obstacles
-        if self.check_collision():
-            if not self.game_over:
+            elif event == GAME_OVER:
                 self.sound_game_over.play()
                 pygame.mixer.music.stop()  # Stop background music
-            self.game_over = True
+        for player, score in zip(self.players, self.sim.fleet.score.tolist()):
+            player.score = score
+        if self.game_over and self.scores is not None:
+            # Only queued here; the store writes on its own thread
+            results = [(name, player.score) for name, player in zip(self.player_names, self.players)]
+            self.scores.record(results, self.settings.difficulty, self.sim.ticks)
+        latency_tracker.update_applied()
+        if self.spectators is not None:
+            self.spectators.publish(self.sim)
+        frame_profiler.lap("update other")
+
+    def obstacle_positions(self, shift):
+        xs, ys = self.obstacles.positions()
+        return list(zip(xs.tolist(), (ys + shift).tolist()))
+
+    def draw_obstacles(self, shift):
+        scale = self.canvas.scale
+        if self.rock_img:
+            # One batched call for all rocks
+            xs, ys = self.obstacles.positions()
+            positions = zip((xs * scale).tolist(), ((ys + shift) * scale).tolist())
+            self.canvas.surface.blits([(self.rock_img, pos) for pos in positions], doreturn=False)
+        else:
+            for x, y in self.obstacle_positions(shift):
+                Obstacle(x, y).draw(self.canvas.surface, scale)
+
+    def draw(self, alpha=1.0):
+        """Draw the game `alpha` of the way from the previous tick's state to the current one"""
+        # With dirty rects the game-over frame is frozen once drawn: nothing to redraw or present
+        # (until the high scores of the round arrive from the score store) but the debug overlays
+        if self.dirty is not None and self.game_over_drawn and self.high_scores() is self.drawn_high_scores:
+            self.refresh_frozen_overlays()
+            return
+        if self.game_over:
+            alpha = 1.0  # Nothing moves any more
+
+        # Interpolated positions: the river and obstacles all move by the last tick's scroll
+        shift = (1 - alpha) * self.sim.scroll_speed
+        sim, fleet = self.sim, self.sim.fleet
+        xs = (sim.prev_x + (fleet.x - sim.prev_x) * alpha).tolist()
+        ys = (sim.prev_y + (fleet.y - sim.prev_y) * alpha).tolist()
+        for canoe, x, y, racing in zip(self.canoes, xs, ys, fleet.racing.tolist()):
+            canoe.x, canoe.y = x, y
+            canoe.boat_img = self.boat_img if racing or len(self.canoes) == 1 else self.crashed_boat_img
 
-        # Check collision with river banks
-        if self.river.check_collision(self.canoe.get_collision_rect()):
-            if not self.game_over:
-                self.sound_game_over.play()
-                pygame.mixer.music.stop()  # Stop background music
-            self.game_over = True
-    
-    def draw(self):
         # Draw river
-        self.river.draw(self.screen)
+        river_rects = self.river.draw(self.canvas.surface, shift)
+
+        # Draw game objects (the river and obstacles above are drawn once however many canoes there are)
+        for canoe in self.canoes:
+            canoe.draw(self.canvas.surface, self.canvas.scale)
+        self.draw_obstacles(shift)
+        frame_profiler.lap("sprites")
+        self.canvas.present()
+        frame_profiler.lap("scale")
 
         # Draw paddle indicators
         self.left_indicator.draw(self.screen)
         self.right_indicator.draw(self.screen)
 
-        # Draw game objects
-        self.canoe.draw(self.screen)
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen)
-
-        # Draw HUD score box (styled like menu buttons)
-        box = pygame.Rect(10, 10, 240, 80)
-        pygame.draw.rect(self.screen, BTN_BG,  box, border_radius=14)
-        pygame.draw.rect(self.screen, BTN_OUT, box, 2, border_radius=14)
-
-        # Name (smaller) at top of the box
-        name_surface = self.small_font.render(self.player_name, True, (25,25,25))
-        self.screen.blit(name_surface, name_surface.get_rect(center=(box.centerx, box.y + 22)))
-
-        # Score (bigger) centered lower in the box
-        score_font_hud = pygame.font.SysFont(None, 36)
-        score_surface = score_font_hud.render(str(self.player.score), True, (25,25,25))
-        self.screen.blit(score_surface, score_surface.get_rect(center=(box.centerx, box.y + 55)))
-        
+        # Draw HUD score boxes
+        for box, name, player in zip(self.score_boxes, self.player_names, self.players):
+            box.draw(self.screen, name, player.score)
+
         # Draw game over screen with personalized message
         if self.game_over:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill(PALETTE["overlay"])
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.overlay, (0, 0))
 
-            # Get personalized quip based on score
-            title_text = quip_named(self.player.score, self.player_name)
+            # Get personalized quip based on the best score
+            best = max(range(len(self.players)), key=lambda i: self.players[i].score)
+            title_text = quip_named(self.players[best].score, self.player_names[best])
 
             left_margin, right_margin = 60, 60
             maxw = SCREEN_WIDTH - left_margin - right_margin
@@ -262,34 +302,165 @@ class Game:
             # Headline (wrapped)
             y = 150
             for hl in wrap_lines(self.title_font, title_text, maxw):
-                surf = self.title_font.render(hl, True, PALETTE["title"])
+                surf = render_text(self.title_font, hl, PALETTE["title"])
                 self.screen.blit(surf, surf.get_rect(center=(SCREEN_WIDTH//2, y)))
                 y += 64
             y += 12
 
-            # Score display
-            score_line = f"{self.player_name} — {self.player.score} pts"
-            score_surf = self.body_font.render(score_line, True, (255,255,255))
-            self.screen.blit(score_surf, score_surf.get_rect(center=(SCREEN_WIDTH//2, y)))
-            y += 50
+            # Score display (best first)
+            for player, name in sorted(zip(self.players, self.player_names), key=lambda p: -p[0].score):
+                score_line = f"{name} — {player.score} pts"
+                best_score = self.scores.personal_best.get((name, self.settings.difficulty)) if self.scores else None
+                if best_score is not None:
+                    score_line += f"  (best {best_score})"
+                score_surf = render_text(self.body_font, score_line, (255,255,255))
+                self.screen.blit(score_surf, score_surf.get_rect(center=(SCREEN_WIDTH//2, y)))
+                y += 50
 
             # Keycaps near bottom
             key_y = SCREEN_HEIGHT - 64
+
+            # High scores for this difficulty, as many as fit above the keycaps
+            self.drawn_high_scores = self.high_scores()
+            if self.drawn_high_scores:
+                y += 10
+                header = render_text(self.small_font, f"Best on {self.settings.difficulty}", PALETTE["title"])
+                self.screen.blit(header, header.get_rect(center=(SCREEN_WIDTH//2, y)))
+                rows = max(0, (key_y - 40 - y) // 28)
+                for rank, (name, score, played_at) in enumerate(self.drawn_high_scores[:rows], 1):
+                    y += 28
+                    date = time.strftime("%Y-%m-%d", time.localtime(played_at))
+                    line = render_text(self.small_font, f"{rank}. {name} — {score} pts  ({date})", PALETTE["body"])
+                    self.screen.blit(line, line.get_rect(center=(SCREEN_WIDTH//2, y)))
             kx = SCREEN_WIDTH//2
             draw_keycap(self.screen, "R", kx-60, key_y, self.key_font)
             draw_keycap(self.screen, "Q", kx+60, key_y, self.key_font)
-            label = self.small_font.render("Restart              Exit to Menu", True, PALETTE["body"])
+            label = render_text(self.small_font, "Restart              Exit to Menu", PALETTE["body"])
             self.screen.blit(label, label.get_rect(center=(kx, key_y+30)))
-        
-        pygame.display.flip()
+
+            if self.dirty is not None:
+                self.game_over_drawn = True
+                self.game_over_frame = self.screen.copy()  # Under the debug overlays, for refresh_frozen_overlays()
+                self.dirty.invalidate()
+
+        self.draw_debug_overlays()
+        frame_profiler.lap("hud")
+
+        if self.dirty is None:
+            pygame.display.flip()
+        else:
+            self.track_dirty(river_rects, shift)
+            self.dirty.present()
+        latency_tracker.frame_presented()
+        frame_profiler.lap("flip")
+
+    def overlay_contents(self):
+        """What the debug overlays show (False for one that is off)"""
+        return (self.show_latency and self.refresh_latency_lines(),
+                frame_profiler.enabled and (frame_profiler.overlay_rows(), frame_profiler.overlay_title()))
+
+    def draw_debug_overlays(self):
+        """Debug overlays go on top of everything"""
+        self.overlays_shown = latency, profiler = self.overlay_contents()
+        if self.show_latency:
+            self.latency_panel.draw(self.screen, latency)
+        if frame_profiler.enabled:
+            self.profiler_panel.draw(self.screen, *profiler)
+
+    def refresh_frozen_overlays(self):
+        """On the frozen game-over frame, redraw the debug overlays when what they show changed
+        (or one was toggled), over a clean copy of the frame"""
+        if self.overlay_contents() == self.overlays_shown:
+            return
+        self.screen.blit(self.game_over_frame, (0, 0))
+        self.draw_debug_overlays()
+        self.dirty.invalidate()
+        self.dirty.present()
+
+    def high_scores(self):
+        """Best (name, score, played_at) on this difficulty, latest the store has published"""
+        if self.scores is None:
+            return None
+        return self.scores.top.get(self.settings.difficulty)
+
+    def refresh_latency_lines(self):
+        """Overlay text, recomputed twice a second rather than every frame"""
+        now = time.monotonic()
+        if now - self.latency_refreshed >= 0.5:
+            self.latency_lines = latency_tracker.report_lines()
+            self.latency_refreshed = now
+        return self.latency_lines
+
+    def toggle_profiler(self):
+        frame_profiler.toggle()
+        if self.dirty is not None:
+            self.dirty.invalidate()
+
+    def apply_quality(self):
+        """Switch drawing to the governor's current quality level"""
+        self.quality = self.governor.quality
+        scale = min(self.settings.render_scale, self.quality.render_scale)
+        if scale != self.canvas.scale:
+            self.set_render_scale(scale)
+        self.river.set_quality(scale, self.quality.still_water)
+        frame_profiler.set_quality(self.governor.level, self.quality.name)
+        if self.dirty is not None:
+            self.dirty.invalidate()
+
+    def toggle_latency_overlay(self):
+        self.show_latency = not self.show_latency
+        if self.dirty is not None:
+            self.dirty.invalidate()  # Uncover (or cover) the panel area
+
+    def track_dirty(self, river_rects, shift):
+        """Report this frame's changed regions to the dirty-rect tracker"""
+        self.dirty.add_all(river_rects)
+        if self.dirty.full:
+            # Presented in full anyway (during play the river changes the whole screen every frame):
+            # skip the other rects. Where the sprites were is then not recorded, so the next frame is full too
+            self.sprite_rects = None
+            return
+        if self.sprite_rects is None:
+            self.dirty.invalidate()
+            self.sprite_rects = []
+
+        # Sprites: both where they were last frame and where they are now
+        sprite_rects = [canoe.get_draw_rect() for canoe in self.canoes]
+        sprite_rects += [pygame.Rect(x, y, OBSTACLE_WIDTH, OBSTACLE_HEIGHT) for x, y in self.obstacle_positions(shift)]
+        self.dirty.add_all(self.sprite_rects)
+        self.dirty.add_all(sprite_rects)
+        self.sprite_rects = sprite_rects
+
+        # HUD score box and paddle indicators only when what they show changed
+        scores = tuple(player.score for player in self.players)
+        hud_state = (scores, self.left_indicator.active, self.right_indicator.active)
+        for i, box in enumerate(self.score_boxes):
+            if self.hud_state is None or scores[i] != self.hud_state[0][i]:
+                self.dirty.add(box.rect)
+        if self.hud_state is None or hud_state[1] != self.hud_state[1]:
+            self.dirty.add(self.left_indicator.get_rect())
+        if self.hud_state is None or hud_state[2] != self.hud_state[2]:
+            self.dirty.add(self.right_indicator.get_rect())
+        self.hud_state = hud_state
+
+        if self.show_latency:
+            self.dirty.add(self.latency_panel.rect)
+        if frame_profiler.enabled:
+            self.dirty.add(self.profiler_panel.rect)
     
     def run(self):
-        """Main game loop with keyboard controls for testing"""
+        """Main game loop with keyboard controls for testing.
+
+        The simulation advances in fixed ticks of 1/TICK_RATE seconds however
+        fast frames are rendered; slow devices run several ticks per frame,
+        fast ones render in between ticks with interpolation.
+        """
         running = True
+        tick_seconds = 1 / TICK_RATE
+        accumulator = 0.0
+        self.clock.tick()
 
         while running:
-            direction = self.player.get_direction()
-
             # Event handling
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -297,6 +468,12 @@ class Game:
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r and self.game_over:
                         self.reset_game()
+                    elif event.key == pygame.K_F3:
+                        self.toggle_latency_overlay()
+                    elif event.key == pygame.K_F4:
+                        latency_tracker.dump(LATENCY_DUMP)
+                    elif event.key == pygame.K_F5:
+                        self.toggle_profiler()
                     elif event.key == pygame.K_q:
                         if self.game_over:
                             # During game over, Q exits to menu
@@ -305,9 +482,22 @@ class Game:
                             # During gameplay, Q quits entirely
                             return "quit"
 
-            # Update and draw
-            self.update(direction.direction_str, direction.left, direction.right)
-            self.draw()
-            self.clock.tick(FPS)
+            frame_profiler.lap("input")
+
+            # Run as many fixed ticks as the elapsed time covers, then draw in between
+            while accumulator >= tick_seconds:
+                # Polled every tick: BLE input hands out the strokes queued since the last one
+                latency_tracker.begin_tick()
+                directions = [player.get_direction() for player in self.players]
+                frame_profiler.lap("input")
+                self.update([(d.direction_str, d.left, d.right) for d in directions])
+                accumulator -= tick_seconds
+            self.draw(accumulator / tick_seconds)
+            accumulator += min(self.clock.tick(self.settings.max_fps) / 1000, MAX_FRAME_TIME)
+            frame_profiler.lap("tick sleep")
+            if self.governor is not None and self.governor.update(self.clock.get_time(), self.clock.get_rawtime(),
+                                                                  time.monotonic()):
+                self.apply_quality()
+            frame_profiler.end_frame()
 
         return "quit"
\ No newline at end of file
@@ -0,0 +1,123 @@
+import pygame
+from .settings import *
+from .text_cache import render_text
+
+
+class ScoreBox:
+    """HUD score box (styled like menu buttons), kept as a retained surface.
+
+    The box is only re-rendered when the name or score it shows changes;
+    every other frame it is a single blit.
+    """
+    def __init__(self, rect, name_font, score_font):
+        self.rect = pygame.Rect(rect)
+        self.name_font = name_font
+        self.score_font = score_font
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.shown = None  # (name, score) currently rendered
+
+    def draw(self, screen, name, score):
+        if (name, score) != self.shown:
+            self.render(name, score)
+        screen.blit(self.surface, self.rect)
+
+    def render(self, name, score):
+        self.shown = (name, score)
+        self.surface.fill((0, 0, 0, 0))
+        box = self.surface.get_rect()
+        pygame.draw.rect(self.surface, BTN_BG,  box, border_radius=14)
+        pygame.draw.rect(self.surface, BTN_OUT, box, 2, border_radius=14)
+
+        # Name (smaller) at top of the box
+        name_surface = render_text(self.name_font, name, (25,25,25))
+        self.surface.blit(name_surface, name_surface.get_rect(center=(box.centerx, 22)))
+
+        # Score (bigger) centered lower in the box
+        score_surface = render_text(self.score_font, str(score), (25,25,25))
+        self.surface.blit(score_surface, score_surface.get_rect(center=(box.centerx, 55)))
+
+
+class StatsPanel:
+    """Semi-transparent panel of monospaced text lines (debug overlays), re-rendered only when the lines change"""
+    def __init__(self, topleft, font, width=520, line_height=18, padding=8):
+        self.topleft = topleft
+        self.font = font
+        self.width = width
+        self.line_height = line_height
+        self.padding = padding
+        self.surface = None
+        self.shown = None  # Lines currently rendered
+
+    @property
+    def rect(self):
+        if self.surface is None:
+            return pygame.Rect(self.topleft, (0, 0))
+        return self.surface.get_rect(topleft=self.topleft)
+
+    def draw(self, screen, lines):
+        lines = tuple(lines)
+        if lines != self.shown:
+            self.render(lines)
+        screen.blit(self.surface, self.topleft)
+
+    def render(self, lines):
+        self.shown = lines
+        height = len(lines) * self.line_height + self.padding * 2
+        self.surface = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            self.surface.blit(render_text(self.font, line, (230, 245, 255)),
+                              (self.padding, self.padding + i * self.line_height))
+
+
+class BarGraphPanel:
+    """Semi-transparent panel of labelled horizontal bars (milliseconds against a frame budget),
+    re-rendered only when the values change"""
+    def __init__(self, topleft, font, budget_ms=1000 / FPS, width=320, bar_height=12, padding=8):
+        self.topleft = topleft
+        self.font = font
+        self.budget_ms = budget_ms
+        self.width = width
+        self.bar_height = bar_height
+        self.line_height = bar_height + 4
+        self.padding = padding
+        self.label_width = 150
+        self.surface = None
+        self.shown = None  # Rows currently rendered
+
+    @property
+    def rect(self):
+        if self.surface is None:
+            return pygame.Rect(self.topleft, (0, 0))
+        return self.surface.get_rect(topleft=self.topleft)
+
+    def draw(self, screen, rows, title=None):
+        """rows: (label, milliseconds) pairs, under an optional title line"""
+        rows = tuple(rows)
+        if (rows, title) != self.shown:
+            self.render(rows, title)
+        screen.blit(self.surface, self.topleft)
+
+    def render(self, rows, title=None):
+        self.shown = rows, title
+        if title is not None:
+            rows = ((title, None),) + rows
+        height = len(rows) * self.line_height + self.padding * 2
+        self.surface = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 170))
+        bar_x = self.padding + self.label_width
+        bar_width = self.width - bar_x - self.padding
+        for i, (label, ms) in enumerate(rows):
+            y = self.padding + i * self.line_height
+            self.surface.blit(render_text(self.font, label, (230, 245, 255)), (self.padding, y))
+            if ms is None:
+                continue  # Title line
+            value = render_text(self.font, f"{ms:.2f}", (230, 245, 255))
+            self.surface.blit(value, value.get_rect(topright=(bar_x - 8, y)))
+            fraction = min(ms / self.budget_ms, 1.0)
+            color = (90, 200, 90) if fraction < 0.5 else (230, 200, 60) if fraction < 1.0 else (230, 70, 60)
+            pygame.draw.rect(self.surface, color, (bar_x, y + 1, max(1, int(bar_width * fraction)), self.bar_height - 2))
+        # The whole frame budget is the full bar width
+        bars_top = self.padding + (self.line_height if title is not None else 0)
+        pygame.draw.line(self.surface, (230, 245, 255), (bar_x + bar_width, bars_top),
+                         (bar_x + bar_width, height - self.padding))
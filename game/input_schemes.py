@@ -1,11 +1,15 @@
 import pygame
 from game.ble_message import Message
-from game.direction import Direction
+from game.direction import Direction, direction_for
 
 class InputScheme:
     def get_direction(self) -> Direction:
         pass
 
+    def discard_input(self):
+        """Forget input that arrived while nothing was reading it (between rounds)"""
+        pass
+
 class BLEScheme(InputScheme):
     def __init__(self, ble_message: Message):
         self.ble_message = ble_message
@@ -13,6 +17,9 @@ class BLEScheme(InputScheme):
 
     def get_direction(self) -> Direction:
         return self.ble_message.get_direction()
+
+    def discard_input(self):
+        self.ble_message.discard_strokes()
     
 class KeyboardScheme(InputScheme):
     def __init__(self, left_key: int, right_key:int):
@@ -21,11 +28,4 @@ class KeyboardScheme(InputScheme):
 
     def get_direction(self) -> Direction:
         keys = pygame.key.get_pressed()
-        direction = "STOP"
-        if keys[self.left_key] & keys[self.right_key]:
-            direction = "STRAIGHT"
-        elif keys[self.left_key]:
-            direction = "RIGHT"
-        elif keys[self.right_key]:
-            direction = "LEFT"
-        return Direction(keys[self.left_key], keys[self.right_key], direction)
\ No newline at end of file
+        return direction_for(keys[self.left_key], keys[self.right_key])
\ No newline at end of file
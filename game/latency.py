@@ -0,0 +1,153 @@
+import json
+import logging
+import time
+import numpy as np
+
+logger = logging.getLogger("latency")
+
+# Stages a paddle stroke goes through, from the BLE callback to the screen
+STAGES = ("receive->publish", "publish->read", "read->update", "update->present", "total")
+
+
+class LatencyHistogram:
+    """Latency counts in log-linear buckets, like HdrHistogram.
+
+    Values (microseconds) below 2 * SUB_BUCKETS get a bucket each; above that
+    every power of two is split into SUB_BUCKETS linear buckets, so percentiles
+    are within about 3% whatever the magnitude, in a fixed amount of memory.
+    """
+    SUB_BUCKETS = 32
+
+    def __init__(self, max_us=10_000_000):
+        self.max_us = max_us
+        self.counts = np.zeros(self.index(max_us) + 1, dtype=np.int64)
+        self.total = 0
+
+    def index(self, value):
+        value = int(value)
+        if value < 2 * self.SUB_BUCKETS:
+            return max(value, 0)
+        shift = value.bit_length() - 6  # Leaves value >> shift in [32, 64)
+        return (shift + 1) * self.SUB_BUCKETS + (value >> shift) - self.SUB_BUCKETS
+
+    def bucket_value(self, index):
+        """Middle of a bucket's value range"""
+        if index < 2 * self.SUB_BUCKETS:
+            return float(index)
+        shift = index // self.SUB_BUCKETS - 1
+        sub = index % self.SUB_BUCKETS + self.SUB_BUCKETS
+        return (sub << shift) + ((1 << shift) - 1) / 2
+
+    def record(self, value_us):
+        self.counts[self.index(min(value_us, self.max_us))] += 1
+        self.total += 1
+
+    def reset(self):
+        self.counts[:] = 0
+        self.total = 0
+
+
+class RollingHistogram:
+    """Histogram over the last one to two `window`s of seconds (two halves, the older one is dropped in turn)"""
+    def __init__(self, window=10.0):
+        self.window = window
+        self.current = LatencyHistogram()
+        self.previous = LatencyHistogram()
+        self.started = time.monotonic()
+
+    def record(self, value_us, now):
+        if now - self.started >= self.window:
+            self.current, self.previous = self.previous, self.current
+            self.current.reset()
+            self.started = now
+        self.current.record(value_us)
+
+    def percentiles(self, quantiles=(0.5, 0.95, 0.99)):
+        """Values in milliseconds for the quantiles, or None without samples"""
+        counts = self.current.counts + self.previous.counts
+        total = self.current.total + self.previous.total
+        if total == 0:
+            return None
+        cumulative = np.cumsum(counts)
+        indices = np.searchsorted(cumulative, [q * total for q in quantiles])
+        return tuple(self.current.bucket_value(int(i)) / 1000 for i in indices)
+
+    @property
+    def total(self):
+        return self.current.total + self.previous.total
+
+
+class LatencyTracker:
+    """Paddle-to-photon latency, per stage.
+
+    Stroke events carry their receive and publish times (gateway thread).
+    The game thread reports when it read them (strokes_read), when the tick
+    that used them finished (update_applied) and when the frame showing it
+    was presented (frame_presented); each stage lands in its own histogram.
+    """
+    def __init__(self, window=10.0):
+        self.histograms = {stage: RollingHistogram(window) for stage in STAGES}
+        self.read = []  # (stroke, read time) waiting for their tick to finish
+        self.updated = []  # (stroke, update time) waiting for the next presented frame
+
+    def record(self, stage, start, end):
+        self.histograms[stage].record((end - start) * 1_000_000, end)
+
+    def begin_tick(self):
+        """Called before a tick polls input: strokes read by a tick that was never applied (e.g. after game over) are dropped"""
+        self.read.clear()
+
+    def strokes_read(self, strokes, now=None):
+        if not strokes:
+            return
+        now = time.monotonic() if now is None else now
+        for stroke in strokes:
+            self.record("receive->publish", stroke.timestamp, stroke.published)
+            self.record("publish->read", stroke.published, now)
+            self.read.append((stroke, now))
+
+    def update_applied(self, now=None):
+        if not self.read:
+            return
+        now = time.monotonic() if now is None else now
+        for stroke, read in self.read:
+            self.record("read->update", read, now)
+            self.updated.append((stroke, now))
+        self.read.clear()
+
+    def frame_presented(self, now=None):
+        if not self.updated:
+            return
+        now = time.monotonic() if now is None else now
+        for stroke, updated in self.updated:
+            self.record("update->present", updated, now)
+            self.record("total", stroke.timestamp, now)
+        self.updated.clear()
+
+    def summary(self):
+        """{stage: {"count", "p50", "p95", "p99"}} with percentiles in milliseconds"""
+        result = {}
+        for stage, histogram in self.histograms.items():
+            values = histogram.percentiles()
+            result[stage] = {"count": histogram.total}
+            if values is not None:
+                result[stage].update(zip(("p50", "p95", "p99"), values))
+        return result
+
+    def report_lines(self):
+        """One text line per stage, for the in-game overlay"""
+        lines = []
+        for stage, stats in self.summary().items():
+            if "p50" in stats:
+                lines.append(f"{stage:<16} p50 {stats['p50']:6.1f}  p95 {stats['p95']:6.1f}  p99 {stats['p99']:6.1f} ms")
+            else:
+                lines.append(f"{stage:<16} no samples")
+        return lines
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        logger.info(f"Latency percentiles written to {path}")
+
+
+latency_tracker = LatencyTracker()
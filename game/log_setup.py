@@ -0,0 +1,76 @@
+import atexit
+import logging
+import logging.config
+import logging.handlers
+import queue
+import yaml
+
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket: lets through `rate` records per second on average, bursts of up to `burst`.
+
+    Attach it to a logger (not a handler) so dropped records are discarded in the
+    calling thread before they are formatted or queued. The next record let
+    through says how many were suppressed in between.
+    """
+    def __init__(self, rate=5.0, burst=10, name=""):
+        super().__init__(name)
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = None
+        self.suppressed = 0
+
+    def filter(self, record):
+        if self.last is not None:
+            self.tokens = min(self.burst, self.tokens + (record.created - self.last) * self.rate)
+        self.last = record.created
+        if self.tokens < 1:
+            self.suppressed += 1
+            return False
+        self.tokens -= 1
+        if self.suppressed:
+            record.msg = f"{record.msg} [{self.suppressed} suppressed]"
+            self.suppressed = 0
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """Lets through one record in every `every`; warnings and errors always pass"""
+    def __init__(self, every=10, name=""):
+        super().__init__(name)
+        self.every = every
+        self.count = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        self.count += 1
+        return self.count % self.every == 1 or self.every == 1
+
+
+def setup_logging(config_path):
+    """Configure logging from a dictConfig YAML file, then move every handler behind a queue.
+
+    Loggers only put records on an in-memory queue; a background QueueListener
+    thread does the formatting and the slow console and file writes, so logging
+    never blocks the BLE loop or the game loop. Listeners are stopped (and the
+    queues flushed) at exit.
+    """
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
+    logging.config.dictConfig(config)
+
+    loggers = [logging.getLogger()] + [logging.getLogger(name) for name in config.get("loggers", {})]
+    queue_handlers = {}  # Handler set -> the QueueHandler standing in for it
+    for logger in loggers:
+        if not logger.handlers or any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+            continue
+        key = tuple(id(h) for h in logger.handlers)
+        if key not in queue_handlers:
+            records = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(records, *logger.handlers, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+            queue_handlers[key] = logging.handlers.QueueHandler(records)
+        logger.handlers = [queue_handlers[key]]
@@ -1,31 +1,53 @@
 from .game_core import Game
 from .menu import Menu
 from .ble_gateway import BleGateway
-from .ble_message import Message
-import logging.config
-import yaml
+from .paddle_registry import PaddleRegistry
+from .ble_backends import ReplayScanner
+from .spectator import SpectatorServer
+from .score_store import ScoreStore
+from .log_setup import setup_logging
+from .frame_profiler import frame_profiler
+from .settings import PADDLES_YAML, SCORES_DB, TOP_SCORES, PROFILE_CSV, PROFILE_JSON
+import argparse
+import logging
 import pygame
 
-with open("game/log_config.yaml", "r") as f:
-    config = yaml.safe_load(f)
-logging.config.dictConfig(config)
+setup_logging("game/log_config.yaml")
 logger = logging.getLogger("root")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Canoe rowing game")
+    parser.add_argument("--record", metavar="FILE", help="append every BLE advertisement to a capture file")
+    parser.add_argument("--replay", metavar="FILE", help="play a capture file instead of scanning for paddles")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="replay speed (1 = recorded timing, 0 = as fast as possible)")
+    parser.add_argument("--spectator-port", type=int, metavar="PORT",
+                        help="stream the race to spectator screens (python -m game.spectator_viewer) on this port")
+    parser.add_argument("--spectator-host", default="127.0.0.1",
+                        help="address the spectator stream listens on (0.0.0.0 for the whole LAN)")
+    return parser.parse_args()
+
 def main():
-    #create and start ble
-    message = Message()
-    gateway = BleGateway(message)
+    args = parse_args()
+    #create and start ble (paddles are looked up in paddles.yaml)
+    registry = PaddleRegistry.load(PADDLES_YAML)
+    if args.replay:
+        gateway = BleGateway(registry, ReplayScanner.factory(args.replay, args.replay_speed), args.record)
+    else:
+        gateway = BleGateway(registry, capture_path=args.record)
+    scores = ScoreStore(SCORES_DB, TOP_SCORES)
+    spectators = SpectatorServer(args.spectator_host, args.spectator_port) if args.spectator_port else None
     try:
         while True:
-            menu = Menu(message)
-            choice, player = menu.run()
+            menu = Menu(registry)
+            choice, players = menu.run()
             #message from menu quit or start so it quits and starts from main
             if choice == "quit":
                 return
             elif choice == "start":
                 # Get settings from menu
                 settings = menu.settings
-                game = Game(player, settings)
+                game = Game(players, settings, spectators, scores)
 
                 print("=== CANOE ROWING GAME ===")
                 print("Controls:")
@@ -50,6 +72,11 @@ def main():
 
     finally:
         gateway.stop()
+        scores.stop()  # Flushes the rounds still queued
+        if spectators is not None:
+            spectators.stop()
+        if frame_profiler.frames:
+            frame_profiler.dump(PROFILE_CSV, PROFILE_JSON)
         pygame.quit()
 
 if __name__ == "__main__":
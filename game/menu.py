@@ -4,13 +4,18 @@ import pygame, os
 from game.input_schemes import BLEScheme, KeyboardScheme
 from game.player import Player
 from .settings import *
-from .ble_message import Message
+from .paddle_registry import PaddleRegistry
+from .text_cache import get_font, render_text
+from .assets import assets
+from .hud import BarGraphPanel
+from .canvas import Canvas
+from .frame_profiler import frame_profiler
 
 BASE_DIR = os.path.dirname(__file__)
 
 class Menu:
-    def __init__(self, ble_message: Message, start_mode: str = "menu"):
-        self.ble_message = ble_message
+    def __init__(self, registry: PaddleRegistry, start_mode: str = "menu"):
+        self.registry = registry  # Player i rows canoe i
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Canoe Game - Menu")
@@ -18,30 +23,33 @@ class Menu:
 
         # Fonts
         try:
-            self.title_font = pygame.font.SysFont("Impact", 100)
+            self.title_font = get_font("Impact", 100)
         except:
-            self.title_font = pygame.font.SysFont(None, 100)
-        self.font = pygame.font.SysFont("Bahnschrift", 28) if pygame.font.get_init() else pygame.font.SysFont(None, 28)
-        self.small_font = pygame.font.SysFont("Bahnschrift", 22) if pygame.font.get_init() else pygame.font.SysFont(None, 22)
+            self.title_font = get_font(None, 100)
+        self.font = get_font("Bahnschrift", 28) if pygame.font.get_init() else get_font(None, 28)
+        self.small_font = get_font("Bahnschrift", 22) if pygame.font.get_init() else get_font(None, 22)
         # Larger font for configuration screen
         try:
-            self.config_font = pygame.font.SysFont("Bahnschrift", 38)
+            self.config_font = get_font("Bahnschrift", 38)
         except:
-            self.config_font = pygame.font.SysFont(None, 38)
+            self.config_font = get_font(None, 38)
 
-        # Background
-        menu_bg = pygame.image.load(os.path.join(BASE_DIR, 'images', 'menu.png')).convert()
-        self.menu_bg = pygame.transform.scale(menu_bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Frame phase profiler overlay (F5 toggles)
+        self.profiler_panel = BarGraphPanel((SCREEN_WIDTH - 330, 130), get_font("Courier New", 14))
 
         # Load settings
         self.settings = load_settings()
         self.mode = "settings" if start_mode == "settings" else "menu"
 
+        # Background, drawn at the render scale like the game world (buttons and text stay on the window)
+        self.canvas = Canvas(self.screen, self.settings.render_scale, self.settings.smooth_scaling)
+        self.menu_bg = assets.image('menu.png', self.canvas.size(SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
+
         # Music
         pygame.mixer.init()
-        self.menu_music_path = os.path.join(BASE_DIR, 'sounds', 'menu.mp3')
+        self.menu_music_path = os.path.join(SOUNDS_DIR, 'menu.mp3')
         if os.path.exists(self.menu_music_path):
-            pygame.mixer.music.load(self.menu_music_path)
+            pygame.mixer.music.load(assets.music('menu.mp3'), 'mp3')
             pygame.mixer.music.set_volume(self.settings.music_vol / 100)
             pygame.mixer.music.play(-1)
 
@@ -64,21 +72,23 @@ class Menu:
 
         # Names section
         start_names_y = 370
-        self.name_rects = [pygame.Rect(SCREEN_WIDTH//2-220, start_names_y + i*36, 440, 28) for i in range(2)]
+        # Two columns so four names still fit above the back button
+        self.name_rects = [pygame.Rect(SCREEN_WIDTH//2-220 + (i % 2)*225, start_names_y + (i // 2)*36, 215, 28)
+                           for i in range(MAX_PLAYERS)]
         self.active_name = -1
 
     def _draw_btn(self, btn):
         rect, text = btn
         pygame.draw.rect(self.screen, BTN_BG, rect, border_radius=14)
         pygame.draw.rect(self.screen, BTN_OUT, rect, 2, border_radius=14)
-        label = self.font.render(text, True, (25,25,25))
+        label = render_text(self.font, text, (25,25,25))
         self.screen.blit(label, label.get_rect(center=rect.center))
 
     def _draw_slider(self, rect, value, label):
         pygame.draw.rect(self.screen, BTN_OUT, rect, 2, border_radius=8)
         filled = pygame.Rect(rect.x, rect.y, rect.w * (value / 100), rect.h)
         pygame.draw.rect(self.screen, (40,140,255), filled, border_radius=8)
-        txt = self.small_font.render(f"{label}: {int(value)}%", True, (255,255,255))
+        txt = render_text(self.small_font, f"{label}: {int(value)}%", (255,255,255))
         self.screen.blit(txt, (rect.x, rect.y - 22))
 
     def _stop_menu_music(self):
@@ -87,7 +97,18 @@ class Menu:
         except Exception:
             pass
 
-    def configure_player(self):
+    def configure_players(self):
+        """Configure every player in turn. Returns ("start", players) or ("quit", None)."""
+        players = []
+        for index in range(self.settings.players):
+            res, player = self.configure_player(index)
+            if res != "start":
+                return res, None
+            players.append(player)
+        return "start", players
+
+    def configure_player(self, index=0):
+        ble_message = self.registry.message(index)
         configuring = True
         selected_config = "NONE"
         player = None
@@ -96,6 +117,7 @@ class Menu:
             "Keyboard": pygame.Rect(3*SCREEN_WIDTH//4 - 100, 2*SCREEN_HEIGHT//3, 200, 50),
         }
         selected_keys = []
+        pair_status = None  # Result of the last pairing attempt
 
         while configuring:
             pygame.event.pump()
@@ -118,10 +140,28 @@ class Menu:
                         return "start", player
                     elif event.key == pygame.K_q:
                         return "quit", None
+                    elif selected_config == "PADDLES" and event.key in (pygame.K_l, pygame.K_r):
+                        side = "LEFT" if event.key == pygame.K_l else "RIGHT"
+                        if event.mod & pygame.KMOD_SHIFT:
+                            # Unpair this side's paddle
+                            address = self.registry.paddles_of(index).get(side)
+                            if address is not None:
+                                self.registry.unregister(address)
+                            pair_status = f"Unpaired {address}" if address else f"No {side.lower()} paddle paired"
+                        else:
+                            # Pair the unknown paddle that advertised last to this canoe
+                            address = self.registry.pair_latest(index, side)
+                            pair_status = f"Paired {address} as {side.lower()}" if address else "No new paddle seen - row with it first"
                     elif selected_config == "KEYBOARD":
                         selected_keys.append(event.key)
 
-            self.screen.blit(self.menu_bg, (0, 0))
+            self.draw_background()
+
+            # With several players, say whose controls are being set up
+            if self.settings.players > 1:
+                name = self.settings.player_names[index].strip() or f"Player {index+1}"
+                who = render_text(self.config_font, f"{name}'s canoe", (255, 255, 120))
+                self.screen.blit(who, (SCREEN_WIDTH//2 - who.get_width()//2, 40))
 
             match(selected_config):
                 case("NONE"):
@@ -130,9 +170,9 @@ class Menu:
                     text_box.fill((0, 0, 0, 180))
                     self.screen.blit(text_box, ((SCREEN_WIDTH - 700)//2, SCREEN_HEIGHT//3 - 60))
 
-                    t0 = self.config_font.render("Choose how to play:", True, (255, 255, 255))
-                    t1 = self.config_font.render("To play with paddles, press p.", True, (255, 255, 255))
-                    t2 = self.config_font.render("To play with a keyboard, press k.", True, (255, 255, 255))
+                    t0 = render_text(self.config_font, "Choose how to play:", (255, 255, 255))
+                    t1 = render_text(self.config_font, "To play with paddles, press p.", (255, 255, 255))
+                    t2 = render_text(self.config_font, "To play with a keyboard, press k.", (255, 255, 255))
                     self.screen.blit(t0, (SCREEN_WIDTH//2 - t0.get_width()//2, SCREEN_HEIGHT//3 - 30))
                     self.screen.blit(t1, (SCREEN_WIDTH//2 - t1.get_width()//2, SCREEN_HEIGHT//3 + 20))
                     self.screen.blit(t2, (SCREEN_WIDTH//2 - t2.get_width()//2, SCREEN_HEIGHT//3 + 70))
@@ -141,40 +181,50 @@ class Menu:
                     for key, rect in buttons.items():
                         pygame.draw.rect(self.screen, BTN_BG, rect, border_radius=14)
                         pygame.draw.rect(self.screen, BTN_OUT, rect, 2, border_radius=14)
-                        text = self.font.render(key, True, (25,25,25))
+                        text = render_text(self.font, key, (25,25,25))
                         text_rect = text.get_rect(center=rect.center)
                         self.screen.blit(text, text_rect)
                 case("PADDLES"):
                     if player == None:
-                        player = Player(BLEScheme(self.ble_message))
+                        player = Player(BLEScheme(ble_message), index)
 
                     # Create semi-transparent background box for text
                     text_box = pygame.Surface((700, 220), pygame.SRCALPHA)
                     text_box.fill((0, 0, 0, 180))
                     self.screen.blit(text_box, ((SCREEN_WIDTH - 700)//2, SCREEN_HEIGHT//3 - 60))
 
-                    t0 = self.config_font.render("Row with the left paddle to activate", True, (255, 255, 255))
-                    t1 = self.config_font.render("the red circle or the right paddle", True, (255, 255, 255))
-                    t2 = self.config_font.render("to activate the blue circle.", True, (255, 255, 255))
-                    t3 = self.config_font.render("To continue, press ENTER.", True, (255, 255, 120))
+                    t0 = render_text(self.config_font, "Row with the left paddle to activate", (255, 255, 255))
+                    t1 = render_text(self.config_font, "the red circle or the right paddle", (255, 255, 255))
+                    t2 = render_text(self.config_font, "to activate the blue circle.", (255, 255, 255))
+                    t3 = render_text(self.config_font, "To continue, press ENTER.", (255, 255, 120))
                     self.screen.blit(t0, (SCREEN_WIDTH//2 - t0.get_width()//2, SCREEN_HEIGHT//3 - 30))
                     self.screen.blit(t1, (SCREEN_WIDTH//2 - t1.get_width()//2, SCREEN_HEIGHT//3 + 10))
                     self.screen.blit(t2, (SCREEN_WIDTH//2 - t2.get_width()//2, SCREEN_HEIGHT//3 + 50))
                     self.screen.blit(t3, (SCREEN_WIDTH//2 - t3.get_width()//2, SCREEN_HEIGHT//3 + 100))
 
-                    left_ok  = bool(self.ble_message.LEFT)
-                    right_ok = bool(self.ble_message.RIGHT)
+                    left_ok  = bool(ble_message.LEFT)
+                    right_ok = bool(ble_message.RIGHT)
 
                     # Circles: at the start they are greyish and after configuring they are red and blue
                     pygame.draw.circle(self.screen, (200, 0, 0) if left_ok else (100, 100, 100),
                                     (SCREEN_WIDTH//2 - 120, SCREEN_HEIGHT//2 + 80), 35)
-                    ltxt = self.config_font.render("Left (Red)", True, (255, 255, 255))
+                    ltxt = render_text(self.config_font, "Left (Red)", (255, 255, 255))
                     self.screen.blit(ltxt, (SCREEN_WIDTH//2 - 180, SCREEN_HEIGHT//2 + 130))
+                    paired = self.registry.paddles_of(index)
 
                     pygame.draw.circle(self.screen, (0, 0, 200) if right_ok else (100, 100, 100),
                                     (SCREEN_WIDTH//2 + 120, SCREEN_HEIGHT//2 + 80), 35)
-                    rtxt = self.config_font.render("Right (Blue)", True, (255, 255, 255))
+                    rtxt = render_text(self.config_font, "Right (Blue)", (255, 255, 255))
                     self.screen.blit(rtxt, (SCREEN_WIDTH//2 + 50, SCREEN_HEIGHT//2 + 130))
+                    # Which paddle drives each side
+                    for side, x in (("LEFT", SCREEN_WIDTH//2 - 120), ("RIGHT", SCREEN_WIDTH//2 + 120)):
+                        atxt = render_text(self.small_font, paired.get(side, "not paired"), (200, 200, 200))
+                        self.screen.blit(atxt, (x - atxt.get_width()//2, SCREEN_HEIGHT//2 + 165))
+
+                    # Pairing new paddles
+                    hint = pair_status or "New paddle? Row with it, then press L or R to pair it (Shift to unpair)."
+                    ptxt = render_text(self.small_font, hint, (255, 255, 120))
+                    self.screen.blit(ptxt, (SCREEN_WIDTH//2 - ptxt.get_width()//2, SCREEN_HEIGHT - 60))
                 case("KEYBOARD"):
                     # Create semi-transparent background box for text
                     text_box = pygame.Surface((700, 150), pygame.SRCALPHA)
@@ -182,24 +232,76 @@ class Menu:
                     self.screen.blit(text_box, ((SCREEN_WIDTH - 700)//2, SCREEN_HEIGHT//3 - 40))
 
                     if len(selected_keys) == 0:
-                        t1 = self.config_font.render("Press a key (except for q)", True, (255, 255, 255))
-                        t2 = self.config_font.render("to use as the left paddle.", True, (255, 255, 255))
+                        t1 = render_text(self.config_font, "Press a key (except for q)", (255, 255, 255))
+                        t2 = render_text(self.config_font, "to use as the left paddle.", (255, 255, 255))
                         self.screen.blit(t1, (SCREEN_WIDTH//2 - t1.get_width()//2, SCREEN_HEIGHT//3))
                         self.screen.blit(t2, (SCREEN_WIDTH//2 - t2.get_width()//2, SCREEN_HEIGHT//3 + 45))
                     elif len(selected_keys) == 1:
-                        t1 = self.config_font.render("Press a key (except for q)", True, (255, 255, 255))
-                        t2 = self.config_font.render("to use as the right paddle.", True, (255, 255, 255))
+                        t1 = render_text(self.config_font, "Press a key (except for q)", (255, 255, 255))
+                        t2 = render_text(self.config_font, "to use as the right paddle.", (255, 255, 255))
                         self.screen.blit(t1, (SCREEN_WIDTH//2 - t1.get_width()//2, SCREEN_HEIGHT//3))
                         self.screen.blit(t2, (SCREEN_WIDTH//2 - t2.get_width()//2, SCREEN_HEIGHT//3 + 45))
                     else:
                         if (player == None):
-                            player = Player(KeyboardScheme(selected_keys[0], selected_keys[1]))
-                        t1 = self.config_font.render("To continue, press ENTER.", True, (255, 255, 120))
+                            player = Player(KeyboardScheme(selected_keys[0], selected_keys[1]), index)
+                        t1 = render_text(self.config_font, "To continue, press ENTER.", (255, 255, 120))
                         self.screen.blit(t1, (SCREEN_WIDTH//2 - t1.get_width()//2, SCREEN_HEIGHT//3 + 20))
 
             pygame.display.flip()
             self.clock.tick(30)
 
+    def draw_background(self):
+        self.canvas.surface.blit(self.menu_bg, (0, 0))
+        self.canvas.present()
+
+    def draw(self):
+        """Draw the main menu or the settings page (without presenting it)"""
+        # Lapped like Game.draw: the background picture, its scale-up, then text and buttons as hud
+        self.canvas.surface.blit(self.menu_bg, (0, 0))
+        frame_profiler.lap("sprites")
+        self.canvas.present()
+        frame_profiler.lap("scale")
+
+        if self.mode == "menu":
+            title = render_text(self.title_font, "CANOE GAME", (255,255,255))
+            shadow = render_text(self.title_font, "CANOE GAME", (0,0,0))
+            self.screen.blit(shadow, shadow.get_rect(center=(SCREEN_WIDTH//2+3, 120+3)))
+            self.screen.blit(title,  title.get_rect(center=(SCREEN_WIDTH//2,   120)))
+            for b in (self.btn_start, self.btn_settings, self.btn_quit):
+                self._draw_btn(b)
+        else:
+            title = render_text(self.title_font, "Settings", (255,255,255))
+            self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH//2, 80)))
+
+            self._draw_slider(self.music_rect, self.settings.music_vol, "Music Volume")
+            self._draw_slider(self.sfx_rect,   self.settings.sfx_vol,   "SFX Volume")
+
+            # Players & Difficulty
+            for r in (self.players_minus, self.players_plus, self.diff_left, self.diff_right):
+                pygame.draw.rect(self.screen, BTN_BG, r, border_radius=10)
+                pygame.draw.rect(self.screen, BTN_OUT, r, 2, border_radius=10)
+            self.screen.blit(render_text(self.font, "-", (25,25,25)), self.players_minus.move(12,5))
+            self.screen.blit(render_text(self.font, "+", (25,25,25)), self.players_plus.move(12,5))
+            self.screen.blit(render_text(self.font, "<", (25,25,25)), self.diff_left.move(12,5))
+            self.screen.blit(render_text(self.font, ">", (25,25,25)), self.diff_right.move(12,5))
+
+            ptxt = render_text(self.font, f"Players: {self.settings.players}", (255,255,255))
+            self.screen.blit(ptxt, ptxt.get_rect(center=(SCREEN_WIDTH//2, 274)))
+
+            dtxt = render_text(self.font, f"Difficulty: {self.settings.difficulty.upper()}", (255,255,255))
+            self.screen.blit(dtxt, dtxt.get_rect(center=(SCREEN_WIDTH//2, 324)))
+
+            self.screen.blit(render_text(self.font, "Player Names:", (255,255,255)),
+                             (SCREEN_WIDTH//2-220, 342))
+            for i in range(self.settings.players):
+                r = self.name_rects[i]
+                pygame.draw.rect(self.screen, (230,230,230), r, border_radius=8)
+                pygame.draw.rect(self.screen, BTN_OUT, r, 2, border_radius=8)
+                name = self.settings.player_names[i].strip() or f"Player {i+1}"
+                self.screen.blit(render_text(self.small_font, name, (25,25,25)), (r.x+8, r.y+4))
+
+            self._draw_btn(self.btn_back)
+
     def run(self):
         while True:
             for e in pygame.event.get():
@@ -210,17 +312,19 @@ class Menu:
                     if e.key == pygame.K_q and self.mode == "menu":
                         self._stop_menu_music()
                         return "quit", None
+                    elif e.key == pygame.K_F5:
+                        frame_profiler.toggle()
 
                 if self.mode == "menu" and e.type == pygame.MOUSEBUTTONDOWN:
                     if self.btn_start[0].collidepoint(e.pos):
                         # Go to player configuration
-                        res, player = self.configure_player()
+                        res, players = self.configure_players()
                         if res == "quit":
                             self._stop_menu_music()
                             return "quit", None
                         else:
                             self._stop_menu_music()
-                            return res, player
+                            return res, players
                     if self.btn_settings[0].collidepoint(e.pos):
                         self.mode = "settings"
                     if self.btn_quit[0].collidepoint(e.pos):
@@ -242,7 +346,7 @@ class Menu:
                         elif self.players_minus.collidepoint((mx,my)):
                             self.settings.players = max(1, self.settings.players-1)
                         elif self.players_plus.collidepoint((mx,my)):
-                            self.settings.players = min(2, self.settings.players+1)
+                            self.settings.players = min(MAX_PLAYERS, self.settings.players+1)
                         elif self.diff_left.collidepoint((mx,my)) or self.diff_right.collidepoint((mx,my)):
                             order = ["easy","hard"]
                             i = order.index(self.settings.difficulty) if self.settings.difficulty in order else 0
@@ -266,48 +370,14 @@ class Menu:
                             if ch and ch.isprintable():
                                 self.settings.player_names[self.active_name] += ch
 
-            # Draw
-            self.screen.blit(self.menu_bg, (0, 0))
-
-            if self.mode == "menu":
-                title = self.title_font.render("CANOE GAME", True, (255,255,255))
-                shadow = self.title_font.render("CANOE GAME", True, (0,0,0))
-                self.screen.blit(shadow, shadow.get_rect(center=(SCREEN_WIDTH//2+3, 120+3)))
-                self.screen.blit(title,  title.get_rect(center=(SCREEN_WIDTH//2,   120)))
-                for b in (self.btn_start, self.btn_settings, self.btn_quit):
-                    self._draw_btn(b)
-            else:
-                title = self.title_font.render("Settings", True, (255,255,255))
-                self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH//2, 80)))
-
-                self._draw_slider(self.music_rect, self.settings.music_vol, "Music Volume")
-                self._draw_slider(self.sfx_rect,   self.settings.sfx_vol,   "SFX Volume")
-
-                # Players & Difficulty
-                for r in (self.players_minus, self.players_plus, self.diff_left, self.diff_right):
-                    pygame.draw.rect(self.screen, BTN_BG, r, border_radius=10)
-                    pygame.draw.rect(self.screen, BTN_OUT, r, 2, border_radius=10)
-                self.screen.blit(self.font.render("-", True, (25,25,25)), self.players_minus.move(12,5))
-                self.screen.blit(self.font.render("+", True, (25,25,25)), self.players_plus.move(12,5))
-                self.screen.blit(self.font.render("<", True, (25,25,25)), self.diff_left.move(12,5))
-                self.screen.blit(self.font.render(">", True, (25,25,25)), self.diff_right.move(12,5))
-
-                ptxt = self.font.render(f"Players: {self.settings.players}", True, (255,255,255))
-                self.screen.blit(ptxt, ptxt.get_rect(center=(SCREEN_WIDTH//2, 274)))
-
-                dtxt = self.font.render(f"Difficulty: {self.settings.difficulty.upper()}", True, (255,255,255))
-                self.screen.blit(dtxt, dtxt.get_rect(center=(SCREEN_WIDTH//2, 324)))
-
-                self.screen.blit(self.font.render("Player Names:", True, (255,255,255)),
-                                 (SCREEN_WIDTH//2-220, 342))
-                for i in range(self.settings.players):
-                    r = self.name_rects[i]
-                    pygame.draw.rect(self.screen, (230,230,230), r, border_radius=8)
-                    pygame.draw.rect(self.screen, BTN_OUT, r, 2, border_radius=8)
-                    name = self.settings.player_names[i].strip() or f"Player {i+1}"
-                    self.screen.blit(self.small_font.render(name, True, (25,25,25)), (r.x+8, r.y+4))
-
-                self._draw_btn(self.btn_back)
+            frame_profiler.lap("input")
 
+            self.draw()
+            if frame_profiler.enabled:
+                self.profiler_panel.draw(self.screen, frame_profiler.overlay_rows())
+            frame_profiler.lap("hud")
             pygame.display.flip()
+            frame_profiler.lap("flip")
             self.clock.tick(60)
+            frame_profiler.lap("tick sleep")
+            frame_profiler.end_frame()
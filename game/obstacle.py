@@ -8,30 +8,23 @@ class Obstacle:
         self.height = OBSTACLE_HEIGHT
         self.rock_img = rock_img
 
-    def update(self, river_scroll_speed=0):
-        # Move only with river scroll - obstacles are fixed to the river map
-        self.y -= river_scroll_speed
-
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
+        """Draw at `scale` (the render scale: rock_img is expected at that size already)"""
+        x, y = self.x * scale, self.y * scale
         if self.rock_img:
             # Draw rock image
-            screen.blit(self.rock_img, (self.x, self.y))
+            screen.blit(self.rock_img, (x, y))
         else:
             # Fallback to original drawing
+            width, height = self.width * scale, self.height * scale
             pygame.draw.rect(screen, GRAY,
-                            (self.x, self.y, self.width, self.height))
+                            (x, y, width, height))
             pygame.draw.rect(screen, (50, 50, 50),
-                            (self.x, self.y, self.width, self.height), 3)
+                            (x, y, width, height), 3)
             # Add some texture lines
             pygame.draw.line(screen, (70, 70, 70),
-                            (self.x + 10, self.y + 10),
-                            (self.x + 30, self.y + 25), 2)
+                            (x + 10 * scale, y + 10 * scale),
+                            (x + 30 * scale, y + 25 * scale), 2)
             pygame.draw.line(screen, (70, 70, 70),
-                            (self.x + 50, self.y + 15),
-                            (self.x + 70, self.y + 35), 2)
-
-    def get_rect(self):
-        return pygame.Rect(self.x, self.y, self.width, self.height)
-
-    def is_off_screen(self):
-        return self.y > SCREEN_HEIGHT
+                            (x + 50 * scale, y + 15 * scale),
+                            (x + 70 * scale, y + 35 * scale), 2)
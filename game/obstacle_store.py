@@ -0,0 +1,79 @@
+import numpy as np
+from .settings import *
+
+
+class ObstacleStore:
+    """All live obstacles as parallel NumPy arrays (x, y, width, height, counted).
+
+    Slots come from a preallocated pool that doubles when full, so spawning
+    does not allocate objects, and scrolling, scoring, culling and overlap
+    tests are each one vectorized pass however many obstacles (and canoes)
+    there are. Live obstacles are always the first `count` slots, in spawn order.
+    """
+    def __init__(self, capacity=64, canoes=1):
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.width = np.zeros(capacity)
+        self.height = np.zeros(capacity)
+        self.counted = np.zeros((capacity, canoes), dtype=bool)  # Already scored, per canoe
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def spawn(self, x, y, width=OBSTACLE_WIDTH, height=OBSTACLE_HEIGHT):
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i], self.y[i], self.width[i], self.height[i] = x, y, width, height
+        self.counted[i] = False
+        self.count += 1
+
+    def _grow(self):
+        for name in ("x", "y", "width", "height", "counted"):
+            array = getattr(self, name)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def clear(self):
+        self.count = 0
+
+    def scroll(self, river_scroll_speed):
+        """Move every obstacle with the river (they are fixed to the river map)"""
+        self.y[:self.count] -= river_scroll_speed
+
+    def score_passed(self, line_ys, racing):
+        """For every canoe, mark obstacles that moved below its line_y as counted.
+        Returns how many were newly counted per canoe (only canoes still `racing` score)."""
+        n = self.count
+        passed = (self.y[:n, None] > line_ys) & ~self.counted[:n] & racing
+        self.counted[:n] |= passed
+        return np.count_nonzero(passed, axis=0)
+
+    def cull(self, max_y=SCREEN_HEIGHT):
+        """Drop obstacles below max_y, keeping the rest packed at the front in order"""
+        n = self.count
+        keep = self.y[:n] <= max_y
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+        for array in (self.x, self.y, self.width, self.height, self.counted):
+            array[:kept] = array[:n][keep]
+        self.count = kept
+
+    def overlaps(self, lefts, tops, rights, bottoms):
+        """For arrays of boxes (one per canoe), whether any obstacle overlaps each box"""
+        n = self.count
+        x, y = self.x[:n, None], self.y[:n, None]
+        hit = ((x < rights) & (lefts < x + self.width[:n, None]) &
+               (y < bottoms) & (tops < y + self.height[:n, None]))
+        return hit.any(axis=0)
+
+    def positions(self):
+        """(x, y) arrays of the live obstacles"""
+        return self.x[:self.count], self.y[:self.count]
@@ -1,5 +1,6 @@
 import pygame
 from .settings import *
+from .text_cache import get_font, render_text
 class PaddleIndicator:
     def __init__(self, x, y, label):
         self.x = x
@@ -9,6 +10,9 @@ class PaddleIndicator:
         self.width = 80
         self.height = 40
         
+    def get_rect(self):
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
     def set_active(self, active):
         self.active = active
         
@@ -20,8 +24,7 @@ class PaddleIndicator:
                         (self.x, self.y, self.width, self.height), 2)
         
         # Draw label
-        font = pygame.font.Font(None, 24)
-        text = font.render(self.label, True, BLACK)
+        text = render_text(get_font(None, 24), self.label, BLACK)
         text_rect = text.get_rect(center=(self.x + self.width // 2, 
                                           self.y + self.height // 2))
         screen.blit(text, text_rect)
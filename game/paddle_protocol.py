@@ -0,0 +1,21 @@
+"""Decoding of the paddle advertisements (0xFEAA service data).
+
+Payload sent by the paddle firmware:
+    byte 0: paddle state (0 = idle, anything else = stroke in progress)
+    byte 1: sequence counter, incremented by the paddle on every new reading (wraps at 256)
+Any further bytes are ignored, so the firmware can append fields later.
+"""
+
+PADDLE_SERVICE_UUID = "0000feaa-0000-1000-8000-00805f9b34fb"
+
+
+def decode_paddle_payload(payload):
+    """(active, seq) from a paddle payload, or None if it is too short"""
+    if payload is None or len(payload) < 2:
+        return None
+    return payload[0] != 0, payload[1]
+
+
+def decode_service_data(service_data):
+    """(active, seq) from an advertisement's service_data dict, or None if it has no paddle payload"""
+    return decode_paddle_payload(service_data.get(PADDLE_SERVICE_UUID))
@@ -0,0 +1,114 @@
+import logging
+import os
+import time
+import yaml
+from .ble_message import Message
+
+logger = logging.getLogger("ble_gateway")
+
+SIDES = ("LEFT", "RIGHT")
+PAIRING_WINDOW = 3.0  # Seconds an unknown paddle stays a pairing candidate after it last advertised
+MAX_UNKNOWN = 64  # Unknown addresses kept at most (strangers' beacons advertise the same service)
+
+CONFIG_HEADER = """# Paddle registry: which BLE device drives which side of which canoe.
+# Canoe ids are player numbers (0 = player 1). New paddles can be paired from
+# the pairing screen (this file is rewritten when they are).
+"""
+
+
+class PaddleRegistry:
+    """Which BLE paddle drives which side of which canoe, with one Message per canoe.
+
+    `routes` maps a device address straight to (Message, side), so the BLE
+    callback dispatches with a single dict lookup. It is replaced, never
+    modified in place, when paddles are (un)registered, so the menu can pair
+    paddles while the gateway thread keeps reading it without a lock.
+    Addresses that advertise the paddle service but are not registered are
+    remembered in `unknown` (address -> last time seen) for pairing, through
+    saw_unknown(); stale ones are pruned once there are more than MAX_UNKNOWN.
+    """
+    def __init__(self, path=None):
+        self.path = path  # Where register() saves to (None = do not save)
+        self.paddles = {}  # address -> (canoe id, side)
+        self.messages = {}  # canoe id -> Message
+        self.routes = {}  # address -> (Message, side)
+        self.unknown = {}
+
+    @classmethod
+    def load(cls, path):
+        registry = cls(path)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                config = yaml.safe_load(f) or {}
+            for entry in config.get("paddles", []):
+                registry.register(entry["address"], entry["canoe"], entry["side"], save=False)
+        logger.info(f"Loaded {len(registry.paddles)} paddles from {path}")
+        return registry
+
+    def save(self):
+        paddles = [{"address": address, "canoe": canoe, "side": side}
+                   for address, (canoe, side) in sorted(self.paddles.items(), key=lambda p: p[1])]
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(CONFIG_HEADER)
+            yaml.safe_dump({"paddles": paddles}, f, sort_keys=False)
+
+    def message(self, canoe):
+        """Message holding the paddle state of a canoe (created on first use)"""
+        if canoe not in self.messages:
+            self.messages[canoe] = Message()
+        return self.messages[canoe]
+
+    def register(self, address, canoe, side, save=True):
+        """Make `address` drive `side` of `canoe`, replacing whatever it drove before
+        and whichever paddle drove that side before"""
+        side = side.upper()
+        if side not in SIDES:
+            raise ValueError(f"Paddle side must be one of {SIDES}, not {side!r}")
+        replaced = self.paddles_of(canoe).get(side)
+        if replaced is not None and replaced != address:
+            del self.paddles[replaced]
+            logger.info(f"Paddle {replaced} no longer drives canoe {canoe} {side}")
+        self.paddles[address] = (canoe, side)
+        self.unknown.pop(address, None)
+        self.rebuild_routes()
+        logger.info(f"Paddle {address} -> canoe {canoe} {side}")
+        if save and self.path:
+            self.save()
+
+    def unregister(self, address, save=True):
+        if self.paddles.pop(address, None) is not None:
+            self.rebuild_routes()
+            if save and self.path:
+                self.save()
+
+    def rebuild_routes(self):
+        self.routes = {address: (self.message(canoe), side) for address, (canoe, side) in self.paddles.items()}
+
+    def paddles_of(self, canoe):
+        """{side: address} of the paddles registered to a canoe"""
+        return {side: address for address, (c, side) in self.paddles.items() if c == canoe}
+
+    def saw_unknown(self, address, when):
+        """Remember an unregistered paddle advertising (called from the gateway thread)"""
+        self.unknown[address] = when
+        if len(self.unknown) > MAX_UNKNOWN:
+            # Replaced, not modified in place, like routes; the newest MAX_UNKNOWN // 2 survive at most
+            recent = {a: seen for a, seen in self.unknown.items() if when - seen <= PAIRING_WINDOW}
+            if len(recent) > MAX_UNKNOWN // 2:
+                recent = dict(sorted(recent.items(), key=lambda item: item[1])[-(MAX_UNKNOWN // 2):])
+            self.unknown = recent
+
+    def latest_unknown(self, within=PAIRING_WINDOW):
+        """Address of the unregistered paddle that advertised most recently (within `within` seconds), or None"""
+        unknown = dict(self.unknown)  # Written by the gateway thread
+        if not unknown:
+            return None
+        address, seen = max(unknown.items(), key=lambda item: item[1])
+        return address if time.monotonic() - seen <= within else None
+
+    def pair_latest(self, canoe, side):
+        """Register the most recently active unknown paddle as `side` of `canoe`; returns its address or None"""
+        address = self.latest_unknown()
+        if address is not None:
+            self.register(address, canoe, side)
+        return address
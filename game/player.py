@@ -8,4 +8,7 @@ class Player:
         self.score = 0
 
     def get_direction(self) -> Direction:
-        return self.input_scheme.get_direction()
\ No newline at end of file
+        return self.input_scheme.get_direction()
+
+    def discard_input(self):
+        self.input_scheme.discard_input()
\ No newline at end of file
@@ -0,0 +1,88 @@
+import logging
+from collections import namedtuple
+from .settings import *
+
+logger = logging.getLogger("quality")
+
+# What each quality level gives up; every level keeps the savings of the ones before it
+QualityLevel = namedtuple("QualityLevel", "name still_water render_scale")
+LEVELS = (
+    QualityLevel("full", False, 1.0),
+    QualityLevel("still water", True, 1.0),  # Water drawn into the bank layer: one opaque blit, no flow
+    QualityLevel("half resolution", True, 0.5),  # World drawn at half resolution (at most) and scaled up
+)
+
+
+class QualityGovernor:
+    """Steps the quality level down when frames miss their budget and back up when there is headroom.
+
+    Fed every frame with clock.get_time() (whole frame, including the sleep in
+    clock.tick) and clock.get_rawtime() (the work alone), both smoothed. The
+    level goes down one step after frames have been over budget for
+    `down_after` seconds, and up one step after the work has stayed under
+    `headroom` of the budget for `up_after` seconds, counting the work the
+    level saved when it was dropped (measured once the lower level settled):
+    going up must not put the frame back over the budget. A level that has to
+    be dropped again soon after going up still waits twice as long next time.
+    """
+    def __init__(self, target_fps=FPS, down_after=2.0, up_after=5.0, headroom=0.6, smoothing=0.1):
+        self.budget_ms = 1000 / target_fps
+        self.down_after = down_after
+        self.up_after = up_after
+        self.base_up_after = up_after
+        self.headroom = headroom
+        self.smoothing = smoothing
+        self.level = 0
+        self.frame_ms = None  # Smoothed
+        self.work_ms = None
+        self.slow_since = None  # When frames started missing the budget
+        self.fast_since = None  # When the work started fitting well within it
+        self.raised_at = None  # When the level last went up
+        self.lowered = None  # (time, level left, work before) of the last step down, until its saving is known
+        self.savings = {}  # Level -> work in ms it costs over the next level down
+
+    @property
+    def quality(self):
+        return LEVELS[self.level]
+
+    def update(self, frame_ms, work_ms, now):
+        """Feed one frame's times; returns True when the level changed"""
+        if self.frame_ms is None:
+            self.frame_ms, self.work_ms = frame_ms, work_ms
+        else:
+            self.frame_ms += (frame_ms - self.frame_ms) * self.smoothing
+            self.work_ms += (work_ms - self.work_ms) * self.smoothing
+
+        if self.lowered is not None and now - self.lowered[0] >= self.down_after:
+            _, level, work_before = self.lowered
+            self.savings[level] = max(work_before - self.work_ms, 0.0)
+            self.lowered = None
+
+        if self.frame_ms > self.budget_ms * 1.05:
+            self.fast_since = None
+            if self.slow_since is None:
+                self.slow_since = now
+            elif now - self.slow_since >= self.down_after and self.level < len(LEVELS) - 1:
+                if self.raised_at is not None and now - self.raised_at < self.up_after * 2:
+                    self.up_after *= 2  # Went up too early: be slower to try again
+                self.lowered = (now, self.level, self.work_ms)
+                return self.step(+1)
+        elif self.work_ms + self.savings.get(self.level - 1, 0.0) < self.budget_ms * self.headroom:
+            self.slow_since = None
+            if self.fast_since is None:
+                self.fast_since = now
+            elif now - self.fast_since >= self.up_after and self.level > 0:
+                self.raised_at = now
+                return self.step(-1)
+        else:
+            self.slow_since = self.fast_since = None
+        if self.level == 0:
+            self.up_after = self.base_up_after
+        return False
+
+    def step(self, direction):
+        self.level += direction
+        self.slow_since = self.fast_since = None
+        logger.info(f"Quality {'down' if direction > 0 else 'up'} to level {self.level} ({self.quality.name}): "
+                    f"{self.frame_ms:.1f} ms frames, {self.work_ms:.1f} ms work, {self.budget_ms:.1f} ms budget")
+        return True
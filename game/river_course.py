@@ -0,0 +1,44 @@
+import random
+import numpy as np
+
+CURVE_STEP = 0.02  # Curve phase per segment - smaller increment = smoother, wider curves
+CURVE_AMPLITUDE = 100
+JITTER = 5  # Small per-segment variation on top of the sine curve
+MAX_OFFSET = 120  # Keep the river from going too far off center
+
+# splitmix64 constants
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def hash_noise(indices, seed):
+    """Deterministic noise in [-1, 1) for an array of integer indices (hashed, so O(1) per index)"""
+    z = np.asarray(indices, dtype=np.int64).astype(np.uint64) * _GOLDEN + np.uint64(seed)
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) * (2.0 / 2**53) - 1.0
+
+
+class RiverCourse:
+    """Seeded river shape: the bank offset of any world segment, computed on demand.
+
+    The same seed always gives the same river, so any stretch can be queried
+    (ahead of the screen, at the goal, after drifting back) without generating
+    the segments in between. World segment 0 is where the river starts and
+    indices decrease going upstream.
+    """
+    def __init__(self, seed=None, segment_height=5):
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.segment_height = segment_height
+
+    def offsets(self, segment_indices):
+        """Center offsets for an array of world segment indices"""
+        segment_indices = np.asarray(segment_indices, dtype=np.int64)
+        offsets = np.sin(segment_indices * CURVE_STEP) * CURVE_AMPLITUDE
+        offsets += hash_noise(np.atleast_1d(segment_indices), self.seed).reshape(segment_indices.shape) * JITTER
+        return np.clip(offsets, -MAX_OFFSET, MAX_OFFSET)
+
+    def offset_at(self, segment_index):
+        return float(self.offsets([segment_index])[0])
@@ -0,0 +1,163 @@
+import math
+import numpy as np
+from .settings import *
+from .segment_buffer import SegmentBuffer
+from .river_course import RiverCourse
+
+SEGMENT_HEIGHT = 5  # Smaller segments for smoother curves
+MAX_SEGMENTS = 200  # Capacity of the segment buffer (and the bank layer's ring size)
+
+
+class RiverModel:
+    """Pygame-free river state: a scrolling window over a seeded, S-curved RiverCourse.
+
+    Holds everything the game logic needs (scrolling, bounds, bank collisions);
+    River adds textures and drawing on top of it.
+    """
+    def __init__(self, seed=None):
+        self.segment_height = SEGMENT_HEIGHT
+        self.course = RiverCourse(seed, self.segment_height)
+        self.window_size = SCREEN_HEIGHT // self.segment_height + 20  # Segments kept in the cache
+        self.segments = SegmentBuffer(MAX_SEGMENTS)
+        self.first_segment = 0  # World index of segments[0] (goes up when scrolling forward)
+        self.scroll_offset = 0
+        self.total_scroll = 0  # Never wraps - accumulates forever for water animation
+        self.center_offset = SCREEN_WIDTH // 2
+        self.current_scroll_speed = 0  # Track current river scroll speed
+
+        # Fill the initial window from the course
+        self.segments.push_back(self.course.offsets(np.arange(self.window_size)))
+        self.on_segments_exposed(0, len(self.segments))
+
+    def on_segments_exposed(self, start, stop):
+        """Called with the window indices of segments that just entered the window"""
+        pass
+
+    def update(self, speed):
+        """Scroll the river"""
+        self.current_scroll_speed = speed  # Store for water animation adjustment
+        self.scroll_offset += speed
+        self.total_scroll += speed  # Accumulate forever, never wraps
+
+        # Scrolling forward (river moves down on screen)
+        if self.scroll_offset >= self.segment_height:
+            shifted = int(self.scroll_offset // self.segment_height)
+            self.scroll_offset -= shifted * self.segment_height
+            self.shift_window(shifted)
+
+        # Scrolling backward (river moves up on screen)
+        elif self.scroll_offset < 0:
+            shifted = math.ceil(-self.scroll_offset / self.segment_height)
+            self.scroll_offset += shifted * self.segment_height
+            self.shift_window(-shifted)
+
+    def shift_window(self, shifted):
+        """Move the cached window by `shifted` segments, fetching the newly exposed ones from the course"""
+        size = len(self.segments)
+        self.first_segment += shifted
+        if abs(shifted) >= size:
+            # Jumped past the whole window - refill it
+            self.segments.pop_back(size)
+            self.segments.push_back(self.course.offsets(self.first_segment + np.arange(size)))
+            self.on_segments_exposed(0, size)
+        elif shifted > 0:
+            self.segments.pop_front(shifted)
+            self.segments.push_back(self.course.offsets(self.first_segment + np.arange(size - shifted, size)))
+            self.on_segments_exposed(size - shifted, size)
+        elif shifted < 0:
+            self.segments.pop_back(-shifted)
+            self.segments.push_front(self.course.offsets(self.first_segment + np.arange(-shifted)))
+            self.on_segments_exposed(0, -shifted)
+
+    @property
+    def distance_travelled(self):
+        """How far upstream the top of the screen is from where the river started"""
+        return -(self.first_segment * self.segment_height + self.scroll_offset)
+
+    def get_river_bounds_at_distance(self, distances):
+        """Bounds of the river at any upstream distance (or array of them), e.g. GOAL_DISTANCE,
+        without scrolling there. The top of the screen is at distance_travelled."""
+        segment_indices = np.floor(-np.asarray(distances) / self.segment_height).astype(np.int64)
+        center = self.center_offset + self.course.offsets(segment_indices)
+        return center - RIVER_WIDTH // 2, center + RIVER_WIDTH // 2
+
+    def get_river_bounds_at_y(self, y):
+        """Get the left and right bounds of the river at a given y position"""
+        # Determine which segment this y position is in
+        segment_index = int((y + self.scroll_offset) // self.segment_height)
+
+        return self.get_segment_bounds(segment_index)
+
+    def get_river_bounds_at_ys(self, ys):
+        """Vectorized get_river_bounds_at_y: left and right bound arrays for an array of y positions"""
+        segment_indices = np.floor((np.asarray(ys) + self.scroll_offset) / self.segment_height)
+        return self.get_segment_bounds_array(segment_indices.astype(np.intp))
+
+    def span_segment_indices(self, top, bottom):
+        """Window indices of every segment row that the screen span [top, bottom) touches"""
+        first = math.floor((top + self.scroll_offset) / self.segment_height)
+        last = max(first, math.ceil((bottom + self.scroll_offset) / self.segment_height) - 1)
+        return np.arange(first, last + 1)
+
+    def get_river_bounds_in_span(self, top, bottom):
+        """Left and right bound arrays for every segment row in the screen span [top, bottom)"""
+        return self.get_segment_bounds_array(self.span_segment_indices(top, bottom))
+
+    def get_narrowest_bounds(self, top, bottom):
+        """Innermost left and right bounds over the span, i.e. the water free along its whole height"""
+        lefts, rights = self.get_river_bounds_in_span(top, bottom)
+        return float(lefts.max()), float(rights.min())
+
+    def get_narrowest_bounds_array(self, tops, bottoms):
+        """get_narrowest_bounds for arrays of spans (e.g. every canoe's hull) in one lookup"""
+        sh = self.segment_height
+        first = np.floor((np.asarray(tops) + self.scroll_offset) / sh).astype(np.intp)
+        last = np.maximum(first, np.ceil((np.asarray(bottoms) + self.scroll_offset) / sh).astype(np.intp) - 1)
+        # One row of segment indices per span; shorter spans repeat their last row
+        rows = np.minimum(first[:, None] + np.arange((last - first).max() + 1), last[:, None])
+        lefts, rights = self.get_segment_bounds_array(rows.ravel())
+        return lefts.reshape(rows.shape).max(axis=1), rights.reshape(rows.shape).min(axis=1)
+
+    def segment_offsets(self, segment_indices):
+        """Offsets for an array of window segment indices; indices outside the window come from the course"""
+        segment_indices = np.asarray(segment_indices, dtype=np.intp)
+        offsets = self.segments.take(segment_indices)
+        outside = (segment_indices < 0) | (segment_indices >= len(self.segments))
+        if outside.any():
+            offsets[outside] = self.course.offsets(self.first_segment + segment_indices[outside])
+        return offsets
+
+    def get_segment_bounds_array(self, segment_indices):
+        """Left and right bound arrays for an array of window segment indices"""
+        center = self.center_offset + self.segment_offsets(segment_indices)
+        return center - RIVER_WIDTH // 2, center + RIVER_WIDTH // 2
+
+    def get_segment_bounds(self, segment_index):
+        """Get the left and right bounds of the river for a window segment index"""
+        if segment_index < 0 or segment_index >= len(self.segments):
+            offset = self.course.offset_at(self.first_segment + segment_index)
+        else:
+            offset = float(self.segments[segment_index])
+        return self._bounds_for_offset(offset)
+
+    def _bounds_for_offset(self, offset):
+        center = self.center_offset + offset
+        left_bound = center - RIVER_WIDTH // 2
+        right_bound = center + RIVER_WIDTH // 2
+
+        return left_bound, right_bound
+
+    def check_collision(self, canoe_rect):
+        """Check if canoe collides with river banks"""
+        # Test every segment row the hull covers, not just the middle one
+        left_bound, right_bound = self.get_narrowest_bounds(canoe_rect.top, canoe_rect.bottom)
+
+        # Check if canoe is outside river bounds
+        if canoe_rect.left < left_bound or canoe_rect.right > right_bound:
+            return True
+        return False
+
+    def check_collisions(self, lefts, tops, rights, bottoms):
+        """check_collision for arrays of canoe hulls: which of them touch a bank"""
+        left_bounds, right_bounds = self.get_narrowest_bounds_array(tops, bottoms)
+        return (lefts < left_bounds) | (rights > right_bounds)
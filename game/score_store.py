@@ -0,0 +1,116 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger("scores")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,     -- Unix time the round ended
+    player TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    canoes INTEGER NOT NULL,     -- Canoes in the round
+    ticks INTEGER NOT NULL       -- Round length in simulation ticks
+);
+-- Covers the top-N query completely, so it reads N index entries whatever the table size
+CREATE INDEX IF NOT EXISTS scores_top ON scores (difficulty, score DESC, played_at, player);
+CREATE INDEX IF NOT EXISTS scores_player ON scores (player, difficulty, score DESC);
+CREATE INDEX IF NOT EXISTS scores_date ON scores (played_at);
+"""
+
+TOP_QUERY = ("SELECT player, score, played_at FROM scores WHERE difficulty = ? "
+             "ORDER BY score DESC, played_at LIMIT ?")
+BEST_QUERY = "SELECT MAX(score) FROM scores WHERE player = ? AND difficulty = ?"
+
+
+class ScoreStore:
+    """High scores of every finished round, in SQLite (WAL mode).
+
+    The game thread never touches the database: record() and request_top()
+    only queue jobs for a writer thread, which owns the connection, commits
+    everything queued as one transaction and publishes query results by
+    replacing `top` and `personal_best` (so reading them needs no lock).
+    """
+    def __init__(self, path, top_n=5):
+        self.path = path
+        self.top_n = top_n
+        self.top = {}  # difficulty -> [(player, score, played_at)], best first
+        self.personal_best = {}  # (player, difficulty) -> best score
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="score-store", daemon=True)
+        self.thread.start()
+
+    def record(self, results, difficulty, ticks):
+        """Queue a finished round: `results` holds (player name, score) for every canoe"""
+        played_at = time.time()
+        rows = [(played_at, name, difficulty, score, len(results), ticks) for name, score in results]
+        self.jobs.put(("record", rows))
+
+    def request_top(self, difficulty):
+        """Queue a refresh of top[difficulty] (record() refreshes it too)"""
+        self.jobs.put(("top", difficulty))
+
+    def stop(self):
+        self.jobs.put(None)
+        self.thread.join(timeout=5)
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; only the last commits can be lost on power loss
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _run(self):
+        try:
+            connection = self._connect()
+        except sqlite3.Error as e:
+            logger.error(f"High scores disabled, could not open {self.path}: {e}")
+            connection = None
+
+        running = True
+        while running:
+            # Block for one job, then take whatever else queued up meanwhile
+            jobs = [self.jobs.get()]
+            while True:
+                try:
+                    jobs.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+            if None in jobs:
+                jobs = jobs[:jobs.index(None)]
+                running = False
+            if connection is None or not jobs:
+                continue
+            try:
+                self._handle(connection, jobs)
+            except sqlite3.Error as e:
+                logger.error(f"High score update failed: {e}")
+
+        if connection is not None:
+            connection.close()
+
+    def _handle(self, connection, jobs):
+        refresh = set()
+        best = set()
+        with connection:  # One transaction for the whole batch
+            for kind, arg in jobs:
+                if kind == "record":
+                    connection.executemany("INSERT INTO scores (played_at, player, difficulty, score, canoes, ticks) "
+                                           "VALUES (?, ?, ?, ?, ?, ?)", arg)
+                    refresh.update(row[2] for row in arg)
+                    best.update((row[1], row[2]) for row in arg)
+                else:
+                    refresh.add(arg)
+
+        top = dict(self.top)
+        for difficulty in refresh:
+            top[difficulty] = connection.execute(TOP_QUERY, (difficulty, self.top_n)).fetchall()
+        personal_best = dict(self.personal_best)
+        for player, difficulty in best:
+            personal_best[player, difficulty] = connection.execute(BEST_QUERY, (player, difficulty)).fetchone()[0]
+        self.top, self.personal_best = top, personal_best
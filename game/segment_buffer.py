@@ -0,0 +1,57 @@
+import numpy as np
+
+
+class SegmentBuffer:
+    """Fixed-capacity ring buffer of river segment offsets backed by a NumPy array.
+
+    Pushing or popping at either end is O(1) per call (plus a vectorized copy of
+    the pushed batch), so scrolling never shifts the stored offsets around.
+    Index 0 is the segment at the top of the screen.
+    """
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = capacity
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.head = 0  # Slot of index 0
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("segment index out of range")
+        return self.data[(self.head + index) % self.capacity]
+
+    def take(self, indices, default=0.0):
+        """Offsets for an array of indices; indices outside the buffer give `default`"""
+        indices = np.asarray(indices, dtype=np.intp)
+        valid = (indices >= 0) & (indices < self.length)
+        return np.where(valid, self.data[(self.head + indices) % self.capacity], default)
+
+    def push_back(self, values):
+        """Append one offset or a batch of offsets after the last segment"""
+        values = np.atleast_1d(values)
+        if self.length + len(values) > self.capacity:
+            raise IndexError("segment buffer is full")
+        slots = (self.head + self.length + np.arange(len(values))) % self.capacity
+        self.data[slots] = values
+        self.length += len(values)
+
+    def push_front(self, values):
+        """Prepend a batch of offsets; values[0] becomes index 0"""
+        values = np.atleast_1d(values)
+        if self.length + len(values) > self.capacity:
+            raise IndexError("segment buffer is full")
+        self.head = (self.head - len(values)) % self.capacity
+        self.data[(self.head + np.arange(len(values))) % self.capacity] = values
+        self.length += len(values)
+
+    def pop_front(self, count=1):
+        count = min(count, self.length)
+        self.head = (self.head + count) % self.capacity
+        self.length -= count
+
+    def pop_back(self, count=1):
+        self.length -= min(count, self.length)
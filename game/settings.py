@@ -6,11 +6,20 @@ BASE_DIR    = os.path.dirname(__file__)
 IMAGES_DIR  = os.path.join(BASE_DIR, "images")
 SOUNDS_DIR  = os.path.join(BASE_DIR, "sounds")
 SETTINGS_JSON = os.path.join(BASE_DIR, "settings.json")
+PADDLES_YAML = os.path.join(BASE_DIR, "paddles.yaml")
+SCORES_DB = os.path.join(BASE_DIR, "scores.db")
+PROFILE_CSV = os.path.join(BASE_DIR, "profile.csv")  # Frame profiler dump, written on exit
+PROFILE_JSON = os.path.join(BASE_DIR, "profile.json")
 
 # Constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+TICK_RATE = 60  # Simulation ticks per second (all speeds below are per tick)
+MAX_FRAME_TIME = 0.25  # Seconds; longer stalls are not caught up on
+ASSET_BUDGET_MB = 48  # Memory the asset cache may use before evicting unused assets
+PADDLE_STALE_TIMEOUT = 0.5  # Seconds without an advertisement before a paddle counts as idle
+STROKE_QUEUE_SIZE = 64  # Paddle state changes buffered between game ticks (oldest dropped first)
 
 # Colors
 BLACK = (0, 0, 0)
@@ -42,18 +51,26 @@ OBSTACLE_SPEED = 3
 BASE_SPAWN_INTERVAL = 2.0  # seconds (base spawn interval)
 BASE_OBSTACLE_SPEED = 3.0  # base obstacle speed
 GOAL_DISTANCE = 5000  # Distance to travel to win
+MAX_PLAYERS = 4  # Canoes racing on the same river
+TOP_SCORES = 5  # High scores listed on the game over screen
 
 @dataclass
 class UserSettings:
     music_vol: int = 60      # 0–100
     sfx_vol:   int = 80      # 0–100
-    players:   int = 1       # 1..2 (limited to 2 players)
+    players:   int = 1       # 1..MAX_PLAYERS
     difficulty: str = "normal"  # easy|hard
     player_names: list | None = None  # ["Alice","Bob"]
+    dirty_rects: bool = False  # Present only changed screen regions. Only helps on the game over screen: during play every frame is a full flip (see ARCHITECTURE.md)
+    render_scale: float = 1.0  # Draw the game world at this fraction of the window resolution (0.5, 0.75) and scale it up
+    smooth_scaling: bool = False  # Filtered (smoothscale) instead of pixel-doubling scale-up; nicer, a little slower
+    adaptive_quality: bool = True  # Lower the drawing quality step by step when frames miss FPS (see quality.py)
+    max_fps: int = FPS  # Game rendering cap; raise it (e.g. 120, 144) for high refresh displays, the simulation rate does not depend on it
 
     def __post_init__(self):
         if self.player_names is None:
-            self.player_names = ["", ""]
+            self.player_names = []
+        self.player_names = (self.player_names + [""] * MAX_PLAYERS)[:MAX_PLAYERS]
 
 def load_settings() -> "UserSettings":
     try:
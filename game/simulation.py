@@ -0,0 +1,185 @@
+import random
+import numpy as np
+from .settings import *
+from .river_model import RiverModel
+from .obstacle_store import ObstacleStore
+from .frame_profiler import frame_profiler
+
+# Events returned by Simulation.step()
+POINT_SCORED = "point_scored"
+GAME_OVER = "game_over"
+
+
+class Fleet:
+    """Every canoe as parallel arrays (position, still racing, score), so the
+    simulation moves, scores and collides all of them in single passes.
+
+    The canoes start side by side at `y`, centred between the river banks
+    `left` and `right` (the narrowest over the hull), closer together if the
+    usual spacing would put a hitbox over a bank."""
+    def __init__(self, count, y, left, right):
+        self.count = count
+        self.width = CANOE_WIDTH
+        self.height = CANOE_HEIGHT
+        self.speed = CANOE_SPEED
+        margin_x = self.width * 0.15
+        gap = 5  # Between the outer hitboxes and the banks
+        # Range of x where a hitbox fits between the banks with the gap
+        lowest = left - margin_x + gap
+        highest = right - self.width + margin_x - gap
+        spacing = CANOE_WIDTH + 20
+        if count > 1:
+            spacing = min(spacing, max(highest - lowest, 0) / (count - 1))
+        middle = (left + right) / 2 - self.width / 2
+        self.x = middle + (np.arange(count) - (count - 1) / 2) * spacing
+        self.x = np.clip(self.x, lowest, max(lowest, highest))
+        self.y = np.full(count, y, dtype=float)
+        self.racing = np.ones(count, dtype=bool)  # False once crashed
+        self.score = np.zeros(count, dtype=np.int64)
+
+    def collision_boxes(self):
+        """(lefts, tops, rights, bottoms) of the smaller hitboxes used for collisions"""
+        # Shrink hitbox by 30% on all sides
+        margin_x = self.width * 0.15
+        margin_y = self.height * 0.15
+        return (self.x + margin_x, self.y + margin_y,
+                self.x + self.width - margin_x, self.y + self.height - margin_y)
+
+
+class Simulation:
+    """Game state stepping without pygame: no display, audio or pygame clock needed.
+
+    Every step() is one fixed tick of 1/TICK_RATE seconds. Time comes from the
+    `clock` (milliseconds, defaults to the simulated tick time) and randomness
+    from the `rng`, so a run is reproducible and can go as fast as the CPU
+    allows. step() returns events (POINT_SCORED, GAME_OVER) instead of playing
+    sounds; Game renders the state and turns the events into sounds.
+
+    Any number of canoes (`canoes`, default settings.players) race on the same
+    river and obstacles. The canoe furthest up the screen sets the river
+    scroll; the others move relative to the water exactly as it does. A crashed
+    canoe drifts off with the river and the game is over once all have crashed.
+    """
+    def __init__(self, settings=None, clock=None, rng=None, river_factory=RiverModel, canoes=None):
+        self.settings = settings if settings is not None else UserSettings()
+        self.clock = clock if clock is not None else self.tick_time
+        self.rng = rng if rng is not None else random.Random()
+        self.river_factory = river_factory  # Called with a seed; Game passes the drawable River
+        self.canoe_count = canoes if canoes is not None else self.settings.players
+
+        # Apply difficulty settings
+        spf, spdf = difficulty_factors(self.settings.difficulty)
+        self.spawn_interval = BASE_SPAWN_INTERVAL * spf * 1000  # Convert to milliseconds
+        self.obstacle_speed = BASE_OBSTACLE_SPEED * spdf
+
+        self.reset()
+
+    def reset(self):
+        self.river = self.river_factory(self.rng.getrandbits(32))
+        # Start at middle of screen, across the river at that row
+        y = SCREEN_HEIGHT // 2
+        self.fleet = Fleet(self.canoe_count, y, *self.river.get_narrowest_bounds(y, y + CANOE_HEIGHT))
+        self.obstacles = ObstacleStore(canoes=self.canoe_count)
+        self.ticks = 0
+        self.scroll_speed = 0  # River scroll of the last tick
+        # Canoe positions before the last tick
+        self.prev_x, self.prev_y = self.fleet.x.copy(), self.fleet.y.copy()
+        self.game_over = False
+        self.game_won = False
+        self.last_spawn_time = self.clock()
+
+    @property
+    def score(self):
+        """Best score of all canoes (the only score with one canoe)"""
+        return int(self.fleet.score.max())
+
+    def tick_time(self):
+        """Simulated time in milliseconds"""
+        return self.ticks * 1000 / TICK_RATE
+
+    def leader(self):
+        """Index of the canoe setting the river scroll: the highest one still racing"""
+        fleet = self.fleet
+        return int(np.argmin(np.where(fleet.racing, fleet.y, np.inf)))
+
+    def spawn_obstacle(self):
+        # Get river bounds over all rows the obstacle covers, just above the screen
+        # (rows outside the river window come straight from the river course)
+        left_bound, right_bound = self.river.get_narrowest_bounds(-OBSTACLE_HEIGHT, 0)
+
+        # Spawn obstacle within river bounds
+        # Add some margin to keep obstacles away from the banks
+        margin = 20
+        left_bound += margin
+        right_bound -= margin + OBSTACLE_WIDTH
+
+        if right_bound > left_bound:
+            x = self.rng.randint(int(left_bound), int(right_bound))
+            self.obstacles.spawn(x, -OBSTACLE_HEIGHT)
+
+    def check_collisions(self):
+        """Which canoes hit an obstacle or a river bank"""
+        boxes = self.fleet.collision_boxes()  # Use smaller hitboxes
+        return self.obstacles.overlaps(*boxes) | self.river.check_collisions(*boxes)
+
+    def step(self, inputs):
+        """Advance the game by one tick. `inputs` holds (direction, left_paddle, right_paddle)
+        for every canoe. Returns the list of events that happened."""
+        events = []
+        if self.game_over or self.game_won:
+            return events
+        self.ticks += 1
+        fleet = self.fleet
+        racing = fleet.racing.copy()  # Canoes racing at the start of this tick
+        self.prev_x[:] = fleet.x
+        self.prev_y[:] = fleet.y
+
+        directions = [direction for direction, _, _ in inputs]
+        paddling = np.array([bool(left or right) for _, left, right in inputs])
+
+        # Move canoes horizontally
+        dx = [fleet.speed if d == "RIGHT" else -fleet.speed if d == "LEFT" else 0 for d in directions]
+        fleet.x += np.where(racing, dx, 0)
+
+        # Rowing moves the leader UP (fighting the current) and the river banks DOWN (negative scroll);
+        # drifting moves it DOWN and the banks UP (positive scroll)
+        river_scroll_speed = -UPSTREAM_SPEED if paddling[self.leader()] else DOWNSTREAM_DRIFT
+        # Every canoe moves relative to the water like the leader does; limit how far up it can go (around halfway)
+        moved = fleet.y + np.where(paddling, -2 * UPSTREAM_SPEED, 2 * DOWNSTREAM_DRIFT) - river_scroll_speed
+        # Crashed canoes are carried off with the river map, like obstacles
+        fleet.y = np.where(racing, np.maximum(moved, CANOE_MAX_UP_Y), fleet.y - river_scroll_speed)
+        self.river.update(river_scroll_speed)
+        self.scroll_speed = river_scroll_speed
+        frame_profiler.lap("river scroll")
+
+        # Check if canoes hit the bottom of the screen (out of the race)
+        fleet.racing &= fleet.y + fleet.height < SCREEN_HEIGHT
+
+        # Update obstacles with river scroll (they are fixed to the river map)
+        self.obstacles.scroll(river_scroll_speed)
+        # Award points for obstacles that passed each canoe (each is only counted once per canoe)
+        points = self.obstacles.score_passed(fleet.y + fleet.height, racing)
+        fleet.score += points
+        events.extend([POINT_SCORED] * int(points.sum()))
+        self.obstacles.cull(SCREEN_HEIGHT)
+
+        # Spawn new obstacles (using difficulty-based spawn interval)
+        current_time = self.clock()
+        if current_time - self.last_spawn_time > self.spawn_interval:
+            self.spawn_obstacle()
+            self.last_spawn_time = current_time
+        frame_profiler.lap("obstacles")
+
+        # Check collisions with obstacles and river banks
+        fleet.racing &= ~(racing & self.check_collisions())
+        frame_profiler.lap("collisions")
+
+        if not fleet.racing.any():
+            self.end_game(events)
+
+        return events
+
+    def end_game(self, events):
+        if not self.game_over:
+            events.append(GAME_OVER)
+        self.game_over = True
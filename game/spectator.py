@@ -0,0 +1,190 @@
+"""Spectator stream: the game state broadcast to other screens over TCP.
+
+Every tick the game packs its state into one int32 vector (positions in
+quarter pixels):
+
+    header:    tick, river seed, river first segment, scroll offset * 16,
+               game over, canoe count, obstacle count
+    canoes:    x, y, racing, score (per canoe)
+    obstacles: x, y (per obstacle)
+
+The river's segment offsets are a pure function of its seed (RiverCourse), so
+the seed and the window position (first segment + scroll offset) carry them.
+
+On the wire each frame is a uint32 length, one kind byte and a zlib payload.
+KEYFRAME payloads are the vector itself; DELTA payloads are the difference to
+the previous tick's vector (zero-padded when the obstacle count changed),
+which is mostly small repeated numbers and compresses to a few dozen bytes.
+Clients get a keyframe when they connect, every KEYFRAME_INTERVAL ticks and
+whenever they fell behind.
+"""
+import asyncio
+import logging
+import struct
+import threading
+import zlib
+import numpy as np
+
+logger = logging.getLogger("spectator")
+
+KEYFRAME = b"K"
+DELTA = b"D"
+FRAME_HEADER = struct.Struct("<Ic")  # Payload length, kind
+HEADER_SIZE = 7
+CANOE_FIELDS = 4
+OBSTACLE_FIELDS = 2
+KEYFRAME_INTERVAL = 120  # Ticks
+MAX_CLIENT_BACKLOG = 64 * 1024  # Bytes queued for a client before it is skipped until the next keyframe
+QUANT = 4  # Positions are sent in 1/QUANT pixels
+
+
+def pack_state(sim):
+    """The simulation's state as a flat int32 vector (see module docstring)"""
+    fleet, river = sim.fleet, sim.river
+    xs, ys = sim.obstacles.positions()
+    header = np.array([sim.ticks, np.uint32(river.course.seed).astype(np.int32), river.first_segment,
+                       round(river.scroll_offset * 16), sim.game_over, fleet.count, len(xs)], dtype=np.int32)
+    canoes = np.column_stack((np.round(fleet.x * QUANT), np.round(fleet.y * QUANT), fleet.racing, fleet.score))
+    obstacles = np.column_stack((np.round(xs * QUANT), np.round(ys * QUANT)))
+    return np.concatenate((header, canoes.ravel(), obstacles.ravel())).astype(np.int32)
+
+
+def unpack_state(state):
+    """dict view of a state vector: positions back in pixels, river as (seed, first segment, scroll offset)"""
+    tick, seed, first_segment, scroll, game_over, canoes, obstacles = state[:HEADER_SIZE].tolist()
+    canoe_end = HEADER_SIZE + canoes * CANOE_FIELDS
+    canoe_rows = state[HEADER_SIZE:canoe_end].reshape(canoes, CANOE_FIELDS)
+    obstacle_rows = state[canoe_end:canoe_end + obstacles * OBSTACLE_FIELDS].reshape(obstacles, OBSTACLE_FIELDS)
+    return {
+        "tick": tick,
+        "seed": seed & 0xFFFFFFFF,
+        "first_segment": first_segment,
+        "scroll_offset": scroll / 16,
+        "game_over": bool(game_over),
+        "canoe_x": canoe_rows[:, 0] / QUANT,
+        "canoe_y": canoe_rows[:, 1] / QUANT,
+        "racing": canoe_rows[:, 2].astype(bool),
+        "scores": canoe_rows[:, 3].tolist(),
+        "obstacle_x": obstacle_rows[:, 0] / QUANT,
+        "obstacle_y": obstacle_rows[:, 1] / QUANT,
+    }
+
+
+def fit(previous, length):
+    """previous resized to length (cut, or zero-padded) so it lines up with the next state"""
+    if len(previous) >= length:
+        return previous[:length]
+    return np.concatenate((previous, np.zeros(length - len(previous), dtype=np.int32)))
+
+
+def encode_frame(kind, vector):
+    payload = zlib.compress(vector.tobytes(), 1)
+    return FRAME_HEADER.pack(len(payload), kind) + payload
+
+
+class SnapshotDecoder:
+    """Client side: turns keyframes and deltas back into state vectors"""
+    def __init__(self):
+        self.state = None
+
+    def apply(self, kind, payload):
+        """State vector after this frame, or None while waiting for the first keyframe"""
+        vector = np.frombuffer(zlib.decompress(payload), dtype=np.int32)
+        if kind == KEYFRAME:
+            self.state = vector.copy()
+        elif self.state is not None:
+            self.state = fit(self.state, len(vector)) + vector
+        return self.state
+
+
+class SpectatorServer:
+    """Optional asyncio TCP server broadcasting the game state, on its own thread.
+
+    The game thread only calls publish(sim) once per tick, which packs the
+    state vector and hands it to the server's event loop; delta encoding,
+    compression and writing to clients all happen on the server thread.
+    """
+    def __init__(self, host="127.0.0.1", port=8765):
+        self.host = host
+        self.port = port
+        self.clients = {}  # StreamWriter -> needs a keyframe
+        self.previous = None  # Last state sent (server thread)
+        self.bytes_sent = 0
+        self.loop = asyncio.new_event_loop()
+        self.started = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.started.wait(timeout=5)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self._on_client, self.host, self.port))
+            logger.info(f"Spectator server listening on {self.host}:{self.port}")
+        except OSError as e:
+            logger.error(f"Spectator server could not start: {e}")
+            self.server = None
+        self.started.set()
+        if self.server is not None:
+            self.loop.run_forever()
+            self.server.close()
+            self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+    async def _on_client(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        logger.info(f"Spectator connected: {peer}")
+        self.clients[writer] = True
+        try:
+            await reader.read()  # Clients never send anything; returns when they disconnect
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+            logger.info(f"Spectator disconnected: {peer}")
+
+    def publish(self, sim):
+        """Queue the current state for broadcasting (game thread, once per tick)"""
+        if self.server is None or not self.clients:
+            return  # Nobody watching: no work at all (new clients start from a keyframe)
+        self.loop.call_soon_threadsafe(self._broadcast, pack_state(sim))
+
+    def _broadcast(self, state):
+        keyframe_due = self.previous is None or state[0] % KEYFRAME_INTERVAL == 0
+        delta = keyframe = None
+        if not keyframe_due:
+            delta = encode_frame(DELTA, state - fit(self.previous, len(state)))
+        self.previous = state
+
+        for writer, needs_keyframe in list(self.clients.items()):
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                self.clients[writer] = True  # Too slow: skip it, resync with a keyframe later
+                continue
+            if keyframe_due or needs_keyframe:
+                if keyframe is None:
+                    keyframe = encode_frame(KEYFRAME, state)
+                frame = keyframe
+                self.clients[writer] = False
+            else:
+                frame = delta
+            writer.write(frame)
+            self.bytes_sent += len(frame)
+
+    def stop(self):
+        if self.server is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        logger.info(f"Spectator server stopped ({self.bytes_sent // 1024} KiB sent)")
+
+
+async def read_frames(reader):
+    """Yield (kind, payload) frames from a spectator stream"""
+    while True:
+        try:
+            header = await reader.readexactly(FRAME_HEADER.size)
+            length, kind = FRAME_HEADER.unpack(header)
+            payload = await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            return
+        yield kind, payload
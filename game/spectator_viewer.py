@@ -0,0 +1,107 @@
+"""Lightweight spectator screen: draws the race from a spectator stream.
+
+    python -m game.spectator_viewer [host] [port]
+
+Banks, obstacles and canoes are flat shapes, so the viewer needs no game
+assets; the river shape is rebuilt locally from the seed in the stream.
+"""
+import asyncio
+import sys
+import threading
+import numpy as np
+import pygame
+from .settings import *
+from .river_course import RiverCourse
+from .river_model import SEGMENT_HEIGHT
+from .spectator import SnapshotDecoder, read_frames, unpack_state
+from .text_cache import get_font, render_text
+
+CANOE_COLORS = [(200, 40, 40), (40, 70, 200), (240, 200, 40), (40, 170, 80)]
+
+
+class SpectatorClient:
+    """Reads the stream on a background thread and keeps the latest decoded state"""
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.state = None
+        self.connected = False
+        self.thread = threading.Thread(target=lambda: asyncio.run(self._listen()), daemon=True)
+        self.thread.start()
+
+    async def _listen(self):
+        decoder = SnapshotDecoder()
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError:
+                await asyncio.sleep(1)  # Game not running yet: keep trying
+                continue
+            self.connected = True
+            async for kind, payload in read_frames(reader):
+                state = decoder.apply(kind, payload)
+                if state is not None:
+                    self.state = unpack_state(state)
+            self.connected = False
+            writer.close()
+
+
+def draw_state(screen, state, course, font):
+    """Draw one decoded state"""
+    screen.fill((40, 110, 40))
+
+    # River: one polygon from the segment offsets of the visible window
+    rows = np.arange(SCREEN_HEIGHT // SEGMENT_HEIGHT + 2)
+    centers = SCREEN_WIDTH // 2 + course.offsets(state["first_segment"] + rows)
+    ys = rows * SEGMENT_HEIGHT - state["scroll_offset"]
+    left = np.column_stack((centers - RIVER_WIDTH // 2, ys))
+    right = np.column_stack((centers + RIVER_WIDTH // 2, ys))
+    pygame.draw.polygon(screen, (40, 90, 170), np.concatenate((left, right[::-1])).tolist())
+
+    for x, y in zip(state["obstacle_x"].tolist(), state["obstacle_y"].tolist()):
+        pygame.draw.ellipse(screen, GRAY, (x, y, OBSTACLE_WIDTH, OBSTACLE_HEIGHT))
+
+    for i, (x, y, racing) in enumerate(zip(state["canoe_x"].tolist(), state["canoe_y"].tolist(), state["racing"])):
+        color = CANOE_COLORS[i % len(CANOE_COLORS)] if racing else (90, 90, 90)
+        pygame.draw.ellipse(screen, color, (x, y, CANOE_WIDTH, CANOE_HEIGHT))
+
+    for i, score in enumerate(state["scores"]):
+        text = render_text(font, f"Canoe {i + 1}: {score}", CANOE_COLORS[i % len(CANOE_COLORS)])
+        screen.blit(text, (10, 10 + i * 28))
+    if state["game_over"]:
+        text = render_text(font, "GAME OVER", WHITE)
+        screen.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+
+
+def main():
+    host = sys.argv[1] if len(sys.argv) > 1 else "127.0.0.1"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"Canoe Game - Spectator ({host}:{port})")
+    font = get_font(None, 32)
+    clock = pygame.time.Clock()
+    client = SpectatorClient(host, port)
+    course = None
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_q):
+                pygame.quit()
+                return
+
+        state = client.state
+        if state is None:
+            screen.fill(BLACK)
+            text = render_text(font, "Waiting for the game...", WHITE)
+            screen.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+        else:
+            if course is None or course.seed != state["seed"]:
+                course = RiverCourse(state["seed"], SEGMENT_HEIGHT)  # New round, new river
+            draw_state(screen, state, course, font)
+        pygame.display.flip()
+        clock.tick(FPS)
+
+
+if __name__ == "__main__":
+    main()
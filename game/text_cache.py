@@ -0,0 +1,44 @@
+import pygame
+from collections import OrderedDict
+
+_fonts = {}
+
+
+def get_font(name, size):
+    """Shared SysFont for (name, size); built once per process (name=None is pygame's default font)"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color)"""
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, color):
+    """Antialiased font.render() through the shared text cache"""
+    return text_cache.render(font, text, tuple(color))
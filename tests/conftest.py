@@ -0,0 +1,36 @@
+import logging
+import os
+import time
+import pytest
+import yaml
+from game.log_setup import setup_logging
+
+LOG_CONFIG = os.path.join(os.path.dirname(__file__), "..", "game", "log_config.yaml")
+
+
+@pytest.fixture
+def log_lines(tmp_path):
+    """setup_logging() with game/log_config.yaml writing to a temporary file instead of stdout and game/app.log.
+
+    Yields read(name): the lines logged by logger `name`, waiting for the queue listener to write them.
+    """
+    with open(LOG_CONFIG) as f:
+        config = yaml.safe_load(f)
+    log_path = tmp_path / "app.log"
+    config["handlers"]["console"] = {"class": "logging.NullHandler"}
+    config["handlers"]["file"] = {"class": "logging.FileHandler", "formatter": "simple", "filename": str(log_path)}
+    config_path = tmp_path / "log_config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    setup_logging(str(config_path))
+
+    def read(name, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            lines = [line for line in log_path.read_text().splitlines() if f" - {name} - " in line]
+            if lines or time.monotonic() > deadline:
+                return lines
+            time.sleep(0.01)
+
+    yield read
+    for name in ["root"] + list(config["loggers"]):
+        logging.getLogger(None if name == "root" else name).handlers.clear()
@@ -0,0 +1,18 @@
+from game.assets import AssetManager
+
+
+def test_evicts_least_recently_used_unpinned():
+    cache = AssetManager(budget=1000)
+    cache.get("sprite", lambda: b"x" * 400, pin=True)
+    cache.get("old strip", lambda: b"x" * 400)
+    cache.get("new strip", lambda: b"x" * 400)
+    assert list(cache.entries) == ["sprite", "new strip"]
+    assert cache.used == 800
+
+
+def test_held_assets_still_get_evicted_unless_pinned():
+    cache = AssetManager(budget=500)
+    held = cache.get("strip", lambda: b"x" * 400)
+    cache.get("other", lambda: b"x" * 400)
+    assert "strip" not in cache.entries
+    assert held == b"x" * 400
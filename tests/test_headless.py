@@ -0,0 +1,14 @@
+import subprocess
+import sys
+
+
+def test_simulation_imports_without_pygame():
+    code = "import sys, game.simulation; sys.exit('pygame' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_package_still_exports_the_game_classes():
+    code = "import sys, game; game.Simulation; sys.exit('pygame' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+    code = "import game; game.Game, game.Menu, game.River"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
@@ -0,0 +1,8 @@
+import logging
+
+imported_early = logging.getLogger("test_log_setup.early")  # Like the game modules, created before setup_logging()
+
+
+def test_loggers_created_before_setup_still_log(log_lines):
+    imported_early.info("still here")
+    assert any(line.endswith("still here") for line in log_lines("test_log_setup.early"))
@@ -0,0 +1,40 @@
+from game.quality import QualityGovernor
+
+BUDGET = 1000 / 60
+
+
+def run(governor, work_at_level, seconds, now=0.0, frame=0.016):
+    """Feed `seconds` of frames whose work depends on the current level; returns the end time"""
+    for _ in range(int(seconds / frame)):
+        now += frame
+        work = work_at_level[governor.level]
+        governor.update(max(work, BUDGET), work, now)
+    return now
+
+
+def test_steps_down_until_frames_fit():
+    governor = QualityGovernor()
+    run(governor, {0: 25, 1: 19, 2: 12}, 30)
+    assert governor.level == 2
+
+
+def test_does_not_go_back_up_to_a_level_that_would_miss_the_budget():
+    governor = QualityGovernor()
+    now = run(governor, {0: 20, 1: 12, 2: 8}, 10)
+    assert governor.level == 1
+    # Plenty of headroom at level 1, but level 0 cost 8 ms more: it would not fit in 60%
+    run(governor, {0: 17, 1: 9, 2: 6}, 60, now)
+    assert governor.level == 1
+
+
+def test_goes_back_up_when_the_load_drops():
+    governor = QualityGovernor()
+    now = run(governor, {0: 20, 1: 12, 2: 8}, 10)
+    run(governor, {0: 4, 1: 2, 2: 1}, 30, now)
+    assert governor.level == 0
+
+
+def test_level_changes_are_logged(log_lines):
+    governor = QualityGovernor()
+    run(governor, {0: 25, 1: 19, 2: 12}, 30)
+    assert any("Quality down to level 1" in line for line in log_lines("quality"))
@@ -0,0 +1,30 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+from game.river import River
+
+UNDRAWN = (1, 2, 3)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+@pytest.mark.parametrize("scale", (1.0, 0.75, 0.5))
+@pytest.mark.parametrize("shift", (-3, -1.5, -0.5))
+def test_banks_cover_the_screen_when_shifted_up(scale, shift):
+    # Still water draws nothing but the bank layer, so every pixel left UNDRAWN is a hole in it
+    river = River(seed=1, scale=scale, still_water=True)
+    screen = pygame.Surface((round(800 * scale), round(600 * scale))).convert()
+    for _ in range(12):
+        river.update(0.9)  # Walk scroll_offset through a whole segment
+        screen.fill(UNDRAWN)
+        river.draw(screen, shift)
+        mask = pygame.mask.from_threshold(screen, UNDRAWN, (1, 1, 1, 255))
+        assert mask.count() == 0, f"{mask.count()} px undrawn at scroll_offset {river.scroll_offset}"
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from game.river_model import RiverModel
+from game.settings import GOAL_DISTANCE
+
+
+@pytest.mark.parametrize("speeds", ([], [2.5] * 7, [-3] * 11, [1.5, -4.2, 0.9]))
+def test_bounds_at_ys_match_the_scalar_call(speeds):
+    river = RiverModel(seed=3)
+    for speed in speeds:
+        river.update(speed)
+    ys = np.arange(-40, 680, 0.5)  # Above, across and below the screen
+    lefts, rights = river.get_river_bounds_at_ys(ys)
+    expected = [river.get_river_bounds_at_y(y) for y in ys.tolist()]
+    assert lefts.tolist() == [left for left, _ in expected]
+    assert rights.tolist() == [right for _, right in expected]
+
+
+@pytest.mark.parametrize("distance", (0, 7, 1234.5, GOAL_DISTANCE))
+def test_bounds_at_distance_are_found_there_after_rowing(distance):
+    river = RiverModel(seed=5)
+    ahead = river.get_river_bounds_at_distance(distance)
+    while river.distance_travelled < distance:
+        river.update(-min(3, distance - river.distance_travelled))  # Rowing: the river scrolls up
+    assert river.distance_travelled == pytest.approx(distance)
+    assert river.get_river_bounds_at_y(0) == pytest.approx(ahead)
+
+
+def test_bounds_at_distance_take_arrays():
+    river = RiverModel(seed=5)
+    distances = np.array([-50, 0, 400, GOAL_DISTANCE])
+    lefts, rights = river.get_river_bounds_at_distance(distances)
+    expected = [river.get_river_bounds_at_distance(d) for d in distances.tolist()]
+    assert lefts.tolist() == [float(left) for left, _ in expected]
+    assert rights.tolist() == [float(right) for _, right in expected]
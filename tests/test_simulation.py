@@ -0,0 +1,16 @@
+import random
+import pytest
+from game.settings import MAX_PLAYERS
+from game.simulation import Simulation
+
+SEEDS = range(10)
+
+
+@pytest.mark.parametrize("canoes", range(1, MAX_PLAYERS + 1))
+@pytest.mark.parametrize("seed", SEEDS)
+def test_every_canoe_starts_inside_the_banks(canoes, seed):
+    sim = Simulation(rng=random.Random(seed), canoes=canoes)
+    assert not sim.check_collisions().any()
+    sim.step([("STOP", False, False)] * canoes)
+    assert sim.fleet.racing.all()
+    assert not sim.game_over